@@ -10,17 +10,36 @@ Usage:
 """
 
 import numpy as np
+import math
 import json
 import time
 import os
+import sys
+import queue
+import threading
 import csv
 import argparse
 import gzip
 import copy
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import matplotlib.pyplot as plt
+from types import SimpleNamespace
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 import matplotlib.patches as patches
-from matplotlib.colors import LinearSegmentedColormap
+from matplotlib.collections import LineCollection, PatchCollection
+from matplotlib.colors import LinearSegmentedColormap, hsv_to_rgb
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None  # Optional - pip install numba to compile the per-tick kernels
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # Optional - pip install orjson for faster live state writes
 
 # --- CONFIGURATION ---
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -29,12 +48,85 @@ LIVE_CONFIG_FILE = os.path.join(BASE_DIR, "hive_config_live.json")
 
 HISTORY_FILE = os.path.join(BASE_DIR, "hive_state.json")
 
+# Pheromone decay is memory-bound - threading it only pays off on large grids
+PARALLEL_DECAY_MIN_GRID = 256
+
+# When the run loop stays behind schedule, metrics sampling backs off to at most this
+# multiple of the configured sample_rate
+MAX_SAMPLE_BACKOFF = 8
+
+# Number of evenly spaced directions a hopper can jump in
+HOP_DIRECTIONS = 64
+
+# Once-a-second progress line; {extra} carries the mode and hunger details
+PROGRESS_FMT = ("  [{pct:5.1f}%] Tick {tick:5d} | Spread: {spread:5.1f} | Nearest: {nearest:4.1f} | "
+                "Collisions: {collisions:2d}{extra}\n")
+
+# One metrics sample per row of Simulation.metrics_history - calculate_metrics() keys, then
+# the sample's tick and time (also the CSV column order)
+METRICS_DTYPE = np.dtype([
+    ("avg_neighbor_distance", "f8"), ("avg_nearest_neighbor", "f8"), ("swarm_spread", "f8"),
+    ("center_x", "f8"), ("center_y", "f8"), ("velocity_alignment", "f8"), ("collisions", "i4"),
+    ("coverage_percent", "f8"), ("drone_count", "i4"), ("food_remaining", "f8"),
+    ("food_depleted", "i4"), ("food_consumed_pct", "f8"), ("queen_food", "f8"), ("carriers", "i4"),
+    ("trips_completed", "i4"), ("avg_hunger", "f8"), ("min_hunger", "i4"), ("starving", "i4"),
+    ("desperate", "i4"), ("tick", "i4"), ("time", "f8"),
+])
+
+# Drone states, in the order used by the recorder's state codes
+RECORDING_STATES = ("searching", "carrying", "scouting")
+
+# What the registry keeps of a permanently dead drone (no trail or behavior state)
+DeadRecord = namedtuple("DeadRecord", "x y type death_tick drone_id")
+
+# Behavior mode IDs (parsed once from the comma-separated behavior_mode string)
+MODE_AVOID = 0
+MODE_FLOCK = 1
+MODE_ALIGN = 2
+MODE_FORAGE = 3
+MODE_SCATTER = 4
+MODE_SWARM = 5
+MODE_RANDOM = 6
+MODE_FEED_QUEEN = 7
+MODE_BOIDS = 8
+
+# Mode name -> (mode ID, behavior_params weight key, default weight)
+MODES = {
+    "AVOID": (MODE_AVOID, "avoid_weight", 2.0),
+    "FLOCK": (MODE_FLOCK, "flock_weight", 1.0),
+    "ALIGN": (MODE_ALIGN, "align_weight", 0.5),
+    "FORAGE": (MODE_FORAGE, "forage_weight", 2.0),
+    "SCATTER": (MODE_SCATTER, "scatter_weight", 1.0),
+    "SWARM": (MODE_SWARM, "swarm_weight", 1.0),
+    "RANDOM": (MODE_RANDOM, "random_weight", 0.3),
+    "FEED_QUEEN": (MODE_FEED_QUEEN, "feed_queen_weight", 3.0),
+    "BOIDS": (MODE_BOIDS, None, 1.0),  # BOIDS combines avoid+flock+align internally
+}
+
+# Behavior modes that read the per-drone neighbor reductions
+NEIGHBOR_MODES = {MODE_AVOID, MODE_FLOCK, MODE_ALIGN, MODE_BOIDS}
+
+# One drone's neighbors within neighbor_radius: count, summed offsets to them, summed
+# velocities, and the separation push from those closer than separation_distance + 2
+NeighborSums = namedtuple("NeighborSums", "count dx dy vx vy sep_x sep_y")
+
+
+def mode_flag(mode_id):
+    """Bit for a mode ID in Simulation.mode_flags"""
+    return 1 << mode_id
+
+
+NEIGHBOR_MODE_FLAGS = sum(mode_flag(m) for m in NEIGHBOR_MODES)
+
 DEFAULT_CONFIG = {
     "simulation": {
         "tick_rate": 30,
         "duration_seconds": 60,
         "grid_size": 100,
-        "live_view": True
+        "live_view": True,
+        "live_view_interval": 3,  # Ticks between hive_state.json writes (~10 Hz at 30 Hz, the dashboard poll rate)
+        "grid_dtype": "float32",  # Pheromone grid precision: "float32" or "float16" (half the memory, pure numpy paths)
+        "max_markers": 10000  # Death/food/smell markers kept per kind (oldest drop off)
     },
     "drones": {
         "count": 20,
@@ -84,18 +176,145 @@ DEFAULT_CONFIG = {
 }
 
 
+def _to_int32(values):
+    """Wrap int64 values to the int32 range (JavaScript ToInt32)"""
+    return (values + 2**31) % 2**32 - 2**31
+
+
+def drone_hues(drone_ids):
+    """Hue in [0, 1) per drone ID - stringToHue() from static/js/hive-core.js, vectorized
+
+    Deterministic across runs (unlike Python's salted str hash) and matches the dashboard.
+    Loops over character positions; each step hashes that character for every ID at once.
+    """
+    ids = np.array(list(drone_ids), dtype=str)
+    codes = ids[:, np.newaxis].view(np.uint32).astype(np.int64)  # (n, max_len), zero-padded
+    lengths = np.char.str_len(ids)
+    h = np.zeros(len(ids), dtype=np.int64)
+    for i in range(codes.shape[1]):
+        # hash = charCode + ((hash << 5) - hash), with JavaScript's int32 shift
+        stepped = codes[:, i] + _to_int32(_to_int32(h) * 32) - h
+        h = np.where(i < lengths, stepped, h)
+    return np.abs(np.fmod(h, 360)) / 360.0
+
+
+def drone_colors(drone_ids):
+    """RGB color per drone - hue from a hash of the drone ID, full saturation/value"""
+    hues = drone_hues(drone_ids)
+    ones = np.ones_like(hues)
+    return hsv_to_rgb(np.column_stack([hues, ones, ones]))
+
+
+def marker_positions(items):
+    """(N, 2) array of the x/y fields of marker or drone dicts"""
+    return np.array([(m["x"], m["y"]) for m in items], dtype=float).reshape(-1, 2)
+
+
+# --- COMPILED KERNELS (numba, when installed) ---
+
+if njit is not None:
+    @njit(cache=True)
+    def _inside_food_jit(x, y, food_x, food_y, food_r2, food_active):
+        for f in range(food_x.shape[0]):
+            if food_active[f]:
+                fx, fy = food_x[f] - x, food_y[f] - y
+                if fx * fx + fy * fy < food_r2[f]:
+                    return True
+        return False
+
+    @njit(cache=True)
+    def _near_food_jit(x, y, food_x, food_y, min_d2):
+        for f in range(food_x.shape[0]):
+            fx, fy = food_x[f] - x, food_y[f] - y
+            if fx * fx + fy * fy < min_d2:
+                return True
+        return False
+
+    @njit(parallel=True, cache=True)
+    def _decay_grid_parallel(grid, rate):
+        for i in prange(grid.shape[0]):
+            for j in range(grid.shape[1]):
+                grid[i, j] *= rate
+
+    # Neighbor reductions for drone i (see Simulation._neighbor_sums) in one pass over the rows
+    @njit(cache=True)
+    def _neighbor_sums_jit(i, xs, ys, vxs, vys, radius2, sep2):
+        count = 0
+        dx = dy = vx = vy = sx = sy = 0.0
+        for j in range(xs.shape[0]):
+            ox, oy = xs[j] - xs[i], ys[j] - ys[i]
+            dist2 = ox * ox + oy * oy
+            if dist2 > 0 and dist2 <= radius2:
+                count += 1
+                dx += ox
+                dy += oy
+                vx += vxs[j]
+                vy += vys[j]
+                if dist2 < sep2:
+                    w = 1.0 / np.sqrt(max(dist2, 0.25))
+                    sx -= ox * w
+                    sy -= oy * w
+        return count, dx, dy, vx, vy, sx, sy
+
+    # Neighbor-distance metrics: sum/count of distances to neighbors within max_d2, and of
+    # each drone's nearest such neighbor
+    @njit(parallel=True, cache=True)
+    def _neighbor_stats_jit(d2, max_d2):
+        n = d2.shape[0]
+        dist_sum = nearest_sum = 0.0
+        near_count = nearest_count = 0
+        for i in prange(n):
+            nearest = np.inf
+            for j in range(n):
+                dist2 = d2[i, j]
+                if dist2 > 0 and dist2 <= max_d2:
+                    dist_sum += np.sqrt(dist2)
+                    near_count += 1
+                    nearest = min(nearest, dist2)
+            if nearest < np.inf:
+                nearest_sum += np.sqrt(nearest)
+                nearest_count += 1
+        return dist_sum, near_count, nearest_sum, nearest_count
+
+
 class SimulationRecorder:
-    """Records simulation keyframes for playback"""
+    """Records simulation keyframes for playback
+
+    Keyframes are stored columnar - one array per field, indexed by the drone roster
+    captured at start() - and only expanded into the per-drone JSON layout the web
+    viewer expects when saved. recording.format = "npz" saves the columns directly.
+    """
 
-    def __init__(self, keyframe_interval=1.0):
+    TRAIL_LENGTH = 10  # Trail positions kept per drone per keyframe
+
+    def __init__(self, keyframe_interval=1.0, file_format="json"):
         self.keyframe_interval = keyframe_interval
-        self.keyframes = []
+        self.file_format = file_format
         self.events = []
         self.metadata = {}
         self.initial_state = {}
         self.start_time = None
         self.last_keyframe_time = -999
 
+        # Drone roster (respawned drones keep their ID, so it never grows)
+        self.drone_ids = []
+        self.drone_types = []
+        self._roster = {}
+
+        # Per-keyframe columns
+        self.kf_t = []
+        self.kf_tick = []
+        self.kf_x = []          # (N,) int16, -1 = drone not alive
+        self.kf_y = []
+        self.kf_hunger = []
+        self.kf_state = []      # (N,) int8 index into RECORDING_STATES
+        self.kf_trail = []      # (N, TRAIL_LENGTH, 2) int16, -1 padded
+        self.kf_food_amount = []
+        self.kf_food_consumed = []
+        self.kf_queen_food = []
+        self.kf_trips = []
+        self.kf_drone_count = []
+
     def start(self, sim):
         """Initialize recording"""
         self.start_time = time.time()
@@ -117,6 +336,9 @@ class SimulationRecorder:
                 "max_y": sim.grid_size - sim.margin
             }
         }
+        self.drone_ids = list(sim.drones)
+        self.drone_types = [d.get("type", "worker") for d in sim.drones.values()]
+        self._roster = {did: i for i, did in enumerate(self.drone_ids)}
 
     def record_tick(self, sim, elapsed_time, tick):
         """Capture keyframe if interval elapsed"""
@@ -125,100 +347,217 @@ class SimulationRecorder:
             self.last_keyframe_time = elapsed_time
 
     def _capture_keyframe(self, sim, elapsed_time, tick):
-        """Capture current state as keyframe"""
-        drones = {}
+        """Capture current state as keyframe columns"""
+        n = len(self.drone_ids)
+        xs = np.full(n, -1, dtype=np.int16)
+        ys = np.full(n, -1, dtype=np.int16)
+        hunger = np.zeros(n, dtype=np.int16)
+        state = np.zeros(n, dtype=np.int8)
+        trails = np.full((n, self.TRAIL_LENGTH, 2), -1, dtype=np.int16)
+
         for did, d in sim.drones.items():
+            i = self._roster[did]
+            xs[i] = d["x"]
+            ys[i] = d["y"]
+            hunger[i] = d.get("hunger", 100)
+            state[i] = RECORDING_STATES.index(d.get("state", "searching"))
+            # Include trail data (last 10 positions)
+            trail = list(d.get("trail", ()))[-self.TRAIL_LENGTH:]
+            if trail:
+                trails[i, :len(trail)] = trail
+
+        self.kf_t.append(round(elapsed_time, 2))
+        self.kf_tick.append(tick)
+        self.kf_x.append(xs)
+        self.kf_y.append(ys)
+        self.kf_hunger.append(hunger)
+        self.kf_state.append(state)
+        self.kf_trail.append(trails)
+        self.kf_food_amount.append(np.array([f["amount"] for f in sim.food_sources], dtype=np.float32))
+        self.kf_food_consumed.append(np.array([f["consumed"] for f in sim.food_sources], dtype=bool))
+        self.kf_queen_food.append(sim.queen_food)
+        self.kf_trips.append(sim.trips_completed)
+        self.kf_drone_count.append(len(sim.drones))
+
+    def _keyframe_dict(self, k):
+        """Expand keyframe k into the per-drone layout used by the web viewer"""
+        xs, ys = self.kf_x[k].tolist(), self.kf_y[k].tolist()
+        hunger, state = self.kf_hunger[k].tolist(), self.kf_state[k].tolist()
+        trails = self.kf_trail[k]
+
+        drones = {}
+        for i, did in enumerate(self.drone_ids):
+            if xs[i] < 0:
+                continue  # Dead at this keyframe
             drone_data = {
-                "x": d["x"], "y": d["y"],
-                "hunger": d.get("hunger", 100),
-                "state": d.get("state", "searching"),
-                "type": d.get("type", "worker")
+                "x": xs[i], "y": ys[i],
+                "hunger": hunger[i],
+                "state": RECORDING_STATES[state[i]],
+                "type": self.drone_types[i]
             }
-            # Include trail data (last 10 positions)
-            trail = d.get("trail", [])
+            trail = trails[i]
+            trail = trail[trail[:, 0] >= 0].tolist()
             if trail:
-                drone_data["trail"] = trail[-10:]
+                drone_data["trail"] = trail
             drones[did] = drone_data
 
         food_state = []
-        for f in sim.food_sources:
+        amounts, consumed = self.kf_food_amount[k].tolist(), self.kf_food_consumed[k].tolist()
+        for f, amount, is_consumed in zip(self.initial_state["food_sources"], amounts, consumed):
             food_state.append({
                 "id": f["id"],
-                "amount": round(f["amount"], 1),
-                "consumed": f["consumed"]
+                "amount": round(amount, 1),
+                "consumed": is_consumed
             })
 
-        self.keyframes.append({
-            "t": round(elapsed_time, 2),
-            "tick": tick,
+        return {
+            "t": self.kf_t[k],
+            "tick": self.kf_tick[k],
             "drones": drones,
             "food_state": food_state,
             "metrics": {
-                "queen_food": round(sim.queen_food, 1),
-                "trips_completed": sim.trips_completed,
-                "drone_count": len(sim.drones)
+                "queen_food": round(self.kf_queen_food[k], 1),
+                "trips_completed": self.kf_trips[k],
+                "drone_count": self.kf_drone_count[k]
             }
-        })
+        }
 
     def record_event(self, event_type, elapsed_time, **data):
         """Record discrete event"""
         self.events.append({"t": round(elapsed_time, 2), "type": event_type, **data})
 
     def save(self, sim, filepath):
-        """Save recording to file"""
+        """Save recording to file and return its status line"""
         self.metadata["duration_seconds"] = round(time.time() - self.start_time, 1)
 
-        recording = {
+        if self.file_format == "npz":
+            self._save_npz(sim, filepath)
+        else:
+            recording = {
+                "version": "1.0",
+                "metadata": self.metadata,
+                "initial_state": self.initial_state,
+                "keyframes": [self._keyframe_dict(k) for k in range(len(self.kf_t))],
+                "events": self.events,
+                "final_grids": {
+                    "ghost_grid": sim.ghost_grid.tolist()
+                }
+            }
+
+            json_str = json.dumps(recording, separators=(',', ':'))
+
+            with gzip.open(filepath, 'wt', encoding='utf-8') as f:
+                f.write(json_str)
+
+        return f"    Recording saved: {filepath}"
+
+    def _save_npz(self, sim, filepath):
+        """Save keyframe columns as a compressed NumPy archive (K keyframes x N drones)"""
+        n = len(self.drone_ids)
+        n_food = len(self.initial_state["food_sources"])
+        header = {
             "version": "1.0",
             "metadata": self.metadata,
             "initial_state": self.initial_state,
-            "keyframes": self.keyframes,
             "events": self.events,
-            "final_grids": {
-                "ghost_grid": sim.ghost_grid.tolist()
-            }
+            "drone_types": self.drone_types,
+            "states": RECORDING_STATES
         }
-
-        json_str = json.dumps(recording, separators=(',', ':'))
-
-        with gzip.open(filepath, 'wt', encoding='utf-8') as f:
-            f.write(json_str)
-
-        print(f"    Recording saved: {filepath}")
+        np.savez_compressed(
+            filepath,
+            header=json.dumps(header, separators=(',', ':')),
+            drone_ids=np.array(self.drone_ids),
+            t=np.array(self.kf_t, dtype=np.float32),
+            tick=np.array(self.kf_tick, dtype=np.int32),
+            x=np.array(self.kf_x, dtype=np.int16).reshape(-1, n),
+            y=np.array(self.kf_y, dtype=np.int16).reshape(-1, n),
+            hunger=np.array(self.kf_hunger, dtype=np.int16).reshape(-1, n),
+            state=np.array(self.kf_state, dtype=np.int8).reshape(-1, n),
+            trail=np.array(self.kf_trail, dtype=np.int16).reshape(-1, n, self.TRAIL_LENGTH, 2),
+            food_amount=np.array(self.kf_food_amount, dtype=np.float32).reshape(-1, n_food),
+            food_consumed=np.array(self.kf_food_consumed, dtype=bool).reshape(-1, n_food),
+            queen_food=np.array(self.kf_queen_food, dtype=np.float32),
+            trips_completed=np.array(self.kf_trips, dtype=np.int32),
+            drone_count=np.array(self.kf_drone_count, dtype=np.int32),
+            ghost_grid=sim.ghost_grid
+        )
 
 
 class VideoRecorder:
     """Records simulation frames to MP4 video"""
 
+    FRAME_QUEUE_SIZE = 8  # Captured frames allowed to wait for the writer thread
+
     def __init__(self, fps=10, resolution=(800, 800)):
         self.fps = fps
         self.resolution = resolution
-        self.frames = []
+        self.frame_count = 0
         self.frame_interval = 1.0 / fps
         self.last_frame_time = -999
         self.start_time = None
-
-    def start(self):
-        """Initialize video recording"""
+        self.filepath = None
+        self.writer = None
+        self.fig = None
+        self._frames = None
+        self._frame_thread = None
+
+    def start(self, sim, filepath):
+        """Initialize video recording, open the MP4 stream and build the reusable figure"""
         self.start_time = time.time()
-        self.frames = []
+        self.frame_count = 0
         self.last_frame_time = -999
+        self.filepath = filepath
+        self._open_writer()
+        if self.writer is not None:
+            self._setup_figure(sim)
+            # Ghost grid copies rotate through a fixed ring instead of being allocated per frame.
+            # At most FRAME_QUEUE_SIZE frames wait plus one renders, so the buffer being filled
+            # is never still in use
+            self._grid_buffers = [np.empty_like(sim.ghost_grid) for _ in range(self.FRAME_QUEUE_SIZE + 2)]
+            self._next_buffer = 0
+            self._display_grid = np.empty(sim.ghost_grid.shape[::-1], dtype=np.float32)
+            # Frames are rendered and encoded on one writer thread, off the tick loop
+            self._frames = queue.Queue(maxsize=self.FRAME_QUEUE_SIZE)
+            self._frame_thread = threading.Thread(target=self._frame_loop, daemon=True)
+            self._frame_thread.start()
+
+    def _open_writer(self):
+        """Open a streaming MP4 writer - frames are encoded as they are captured"""
+        try:
+            import imageio.v3 as iio
+            self.writer = iio.imopen(self.filepath, "w", plugin="pyav")
+            self.writer.init_video_stream("libx264", fps=self.fps)
+            self._write_frame = self.writer.write_frame
+            return
+        except Exception:
+            pass  # imageio v3 or pyav not available - try imageio-ffmpeg below
 
-    def should_capture(self, elapsed_time):
-        """Check if we should capture a frame at this time"""
-        return elapsed_time - self.last_frame_time >= self.frame_interval
-
-    def capture_frame(self, sim, elapsed_time):
-        """Capture current simulation state as a frame"""
-        if not self.should_capture(elapsed_time):
+        try:
+            import imageio
+        except ImportError:
+            print("    ERROR: imageio not installed. Run: pip install imageio imageio-ffmpeg")
             return
 
-        self.last_frame_time = elapsed_time
+        try:
+            self.writer = imageio.get_writer(self.filepath, fps=self.fps)
+            self._write_frame = self.writer.append_data
+        except Exception as e:
+            print(f"    Video writer error: {e}")
+            print("    Try: pip install imageio-ffmpeg")
+            self.writer = None
+
+    def _setup_figure(self, sim):
+        """Create the figure once; frames only update artist data
 
-        # Create figure
+        A bare Agg figure, not a pyplot one - it is drawn on the writer thread, and pyplot's
+        GUI backends must only be touched from the main thread.
+        """
         dpi = 100
         fig_size = (self.resolution[0] / dpi, self.resolution[1] / dpi)
-        fig, ax = plt.subplots(figsize=fig_size, dpi=dpi)
+        self.fig = Figure(figsize=fig_size, dpi=dpi)
+        FigureCanvasAgg(self.fig)
+        ax = self.fig.add_subplot()
+        self.ax = ax
 
         # Black background
         ax.set_facecolor('black')
@@ -231,11 +570,9 @@ class VideoRecorder:
             (1.0, 1.0, 1.0)
         ]
         cmap = LinearSegmentedColormap.from_list('pheromone', colors, N=256)
-
-        grid_max = max(sim.ghost_grid.max(), 1)
-        normalized_grid = sim.ghost_grid.T / grid_max
-        ax.imshow(normalized_grid, cmap=cmap, origin='lower',
-                  extent=[0, sim.grid_size, 0, sim.grid_size])
+        self.img_artist = ax.imshow(np.zeros((sim.grid_size, sim.grid_size)), cmap=cmap,
+                                    origin='lower', vmin=0, vmax=1,
+                                    extent=[0, sim.grid_size, 0, sim.grid_size])
 
         # Boundary
         boundary_rect = patches.Rectangle(
@@ -247,44 +584,28 @@ class VideoRecorder:
         )
         ax.add_patch(boundary_rect)
 
-        # Food sources
+        # Food sources (positions are fixed; color and amount update per frame)
+        self.food_patches = []
+        self.food_texts = []
         for food in sim.food_sources:
-            if food["consumed"]:
-                color = 'gray'
-                alpha = 0.5
-            else:
-                ratio = food["amount"] / food["max_amount"]
-                color = (1 - ratio, ratio, 0)
-                alpha = 0.8
-
             food_rect = patches.Rectangle(
                 (food["x"] - food["radius"], food["y"] - food["radius"]),
                 food["radius"] * 2, food["radius"] * 2,
-                linewidth=1, edgecolor='white', facecolor=color, alpha=alpha
+                linewidth=1, edgecolor='white'
             )
             ax.add_patch(food_rect)
-
-            # Food amount text
-            if not food["consumed"]:
-                ax.text(food["x"], food["y"], f'{int(food["amount"])}',
-                        color='white', fontsize=7, ha='center', va='center',
-                        fontweight='bold')
-
-        # Death markers - larger for hoppers
-        for marker in sim.death_markers:
-            size = 10 if marker.get("type") == "hopper" else 6
-            ax.plot(marker["x"], marker["y"], 'x', color='red',
-                    markersize=size, markeredgewidth=2)
-
-        # Food markers (hopper finds)
-        for marker in sim.food_markers:
-            ax.plot(marker["x"], marker["y"], 'x', color='yellow',
-                    markersize=5, markeredgewidth=1.5)
-
-        # Smell markers
-        for marker in sim.smell_markers:
-            ax.plot(marker["x"], marker["y"], 'x', color='white',
-                    markersize=4, markeredgewidth=1, alpha=0.7)
+            self.food_patches.append(food_rect)
+            self.food_texts.append(ax.text(food["x"], food["y"], '',
+                                           color='white', fontsize=7, ha='center', va='center',
+                                           fontweight='bold'))
+
+        # Markers (scatter sizes are points^2)
+        self.death_scatter = ax.scatter([], [], marker='x', color='red',
+                                        linewidths=2, zorder=2)
+        self.food_marker_scatter = ax.scatter([], [], s=25, marker='x', color='yellow',
+                                              linewidths=1.5, zorder=2)
+        self.smell_scatter = ax.scatter([], [], s=16, marker='x', color='white',
+                                        linewidths=1, alpha=0.7, zorder=2)
 
         # Queen
         qx, qy = sim.queen_pos
@@ -302,54 +623,16 @@ class VideoRecorder:
                 ha='center', va='center', fontweight='bold')
 
         # Drone trails
-        for drone_id, drone in sim.drones.items():
-            trail = drone.get("trail", [])
-            if len(trail) >= 2:
-                trail_x = [p[0] for p in trail]
-                trail_y = [p[1] for p in trail]
-                hue = (hash(drone_id) % 360) / 360.0
-                if hue < 1/6:
-                    r, g, b = 1, hue * 6, 0
-                elif hue < 2/6:
-                    r, g, b = 1 - (hue - 1/6) * 6, 1, 0
-                elif hue < 3/6:
-                    r, g, b = 0, 1, (hue - 2/6) * 6
-                elif hue < 4/6:
-                    r, g, b = 0, 1 - (hue - 3/6) * 6, 1
-                elif hue < 5/6:
-                    r, g, b = (hue - 4/6) * 6, 0, 1
-                else:
-                    r, g, b = 1, 0, 1 - (hue - 5/6) * 6
-                ax.plot(trail_x, trail_y, '-', color=(r, g, b),
-                        alpha=0.4, linewidth=1)
-
-        # Drones
-        for drone_id, drone in sim.drones.items():
-            hue = (hash(drone_id) % 360) / 360.0
-            if hue < 1/6:
-                r, g, b = 1, hue * 6, 0
-            elif hue < 2/6:
-                r, g, b = 1 - (hue - 1/6) * 6, 1, 0
-            elif hue < 3/6:
-                r, g, b = 0, 1, (hue - 2/6) * 6
-            elif hue < 4/6:
-                r, g, b = 0, 1 - (hue - 3/6) * 6, 1
-            elif hue < 5/6:
-                r, g, b = (hue - 4/6) * 6, 0, 1
-            else:
-                r, g, b = 1, 0, 1 - (hue - 5/6) * 6
-
-            if drone.get("type") == "hopper":
-                ax.plot(drone["x"], drone["y"], '^', color='cyan',
-                        markersize=7, markeredgecolor='white', markeredgewidth=0.5)
-            else:
-                ax.plot(drone["x"], drone["y"], 'o', color=(r, g, b),
-                        markersize=5, markeredgecolor='white', markeredgewidth=0.5)
+        self.trail_lines = LineCollection([], alpha=0.4, linewidths=1, zorder=2)
+        ax.add_collection(self.trail_lines)
 
-            # Carrying indicator - green ring
-            if drone.get("state") == "carrying":
-                ax.plot(drone["x"], drone["y"], 'o', color='none',
-                        markersize=8, markeredgecolor='lime', markeredgewidth=2)
+        # Drones - workers, hoppers and carrying rings
+        self.worker_scatter = ax.scatter([], [], s=25, marker='o',
+                                         edgecolors='white', linewidths=0.5, zorder=2)
+        self.hopper_scatter = ax.scatter([], [], s=49, marker='^', color='cyan',
+                                         edgecolors='white', linewidths=0.5, zorder=2)
+        self.carrying_scatter = ax.scatter([], [], s=64, marker='o', facecolors='none',
+                                           edgecolors='lime', linewidths=2, zorder=2)
 
         # Configure axes
         ax.set_xlim(0, sim.grid_size)
@@ -357,60 +640,156 @@ class VideoRecorder:
         ax.set_aspect('equal')
         ax.axis('off')
 
-        # Add stats overlay
-        stats_text = f"t={elapsed_time:.1f}s | {len(sim.drones)} drones"
-        if sim.food_sources:
-            stats_text += f" | Queen: {sim.queen_food:.0f}"
-        ax.text(5, sim.grid_size - 5, stats_text,
-                color='white', fontsize=10, verticalalignment='top',
-                fontfamily='monospace', alpha=0.8)
+        # Stats overlay
+        self.stats_text = ax.text(5, sim.grid_size - 5, '',
+                                  color='white', fontsize=10, verticalalignment='top',
+                                  fontfamily='monospace', alpha=0.8)
 
-        # Convert figure to numpy array
-        fig.tight_layout(pad=0)
-        fig.canvas.draw()
-
-        # Get the RGBA buffer
-        buf = fig.canvas.buffer_rgba()
-        frame = np.asarray(buf)
+        self.fig.tight_layout(pad=0)
 
-        # Convert RGBA to RGB
-        frame_rgb = frame[:, :, :3].copy()
-
-        self.frames.append(frame_rgb)
-        plt.close(fig)
+    def should_capture(self, elapsed_time):
+        """Check if we should capture a frame at this time"""
+        return elapsed_time - self.last_frame_time >= self.frame_interval
 
-    def save(self, filepath):
-        """Save frames to MP4 video file"""
-        if not self.frames:
-            print("    No frames to save")
+    def capture_frame(self, sim, elapsed_time):
+        """Capture current simulation state as a frame (rendered and encoded on the writer thread)"""
+        if self.writer is None or not self.should_capture(elapsed_time):
             return
 
-        try:
-            import imageio.v3 as iio
-        except ImportError:
-            try:
-                import imageio as iio
-            except ImportError:
-                print("    ERROR: imageio not installed. Run: pip install imageio imageio-ffmpeg")
+        # Step the frame clock by one interval rather than to elapsed_time, so ticks landing
+        # just past each frame time don't stretch the interval; after a stall (or the first
+        # frame) restart it from now instead of bursting out the missed frames
+        self.last_frame_time += self.frame_interval
+        if elapsed_time - self.last_frame_time > self.frame_interval:
+            self.last_frame_time = elapsed_time
+        # Blocks only when FRAME_QUEUE_SIZE frames are already waiting, so no frame is dropped
+        self._frames.put(self._frame_state(sim, elapsed_time))
+
+    def _frame_state(self, sim, elapsed_time):
+        """Copy everything a frame draws, so the simulation can move on while it renders"""
+        sim._update_snapshot()  # Usually already built for this tick's metrics
+        drones = sim.drones.values()
+        ghost_grid = self._grid_buffers[self._next_buffer]
+        self._next_buffer = (self._next_buffer + 1) % len(self._grid_buffers)
+        np.copyto(ghost_grid, sim.ghost_grid)
+        rgbs = sim.get_drone_colors()
+        segments, trail_colors = [], []
+        for drone, rgb in zip(drones, rgbs):
+            trail = drone.get("trail", [])
+            if len(trail) >= 2:
+                segments.append(list(trail))
+                trail_colors.append(rgb)
+
+        return SimpleNamespace(
+            elapsed_time=elapsed_time,
+            ghost_grid=ghost_grid,
+            foods=[(f["consumed"], f["amount"], f["max_amount"]) for f in sim.food_sources],
+            death_xy=marker_positions(sim.death_markers),
+            death_sizes=[100 if m.get("type") == "hopper" else 36 for m in sim.death_markers],
+            food_marker_xy=marker_positions(sim.food_markers),
+            smell_xy=marker_positions(sim.smell_markers),
+            segments=segments,
+            trail_colors=trail_colors,
+            rgbs=rgbs,
+            xy=np.column_stack((sim._xs, sim._ys)),
+            is_hopper=sim._is_hopper,
+            carrying=sim._carrying,
+            drone_count=len(sim.drones),
+            has_food=bool(sim.food_sources),
+            queen_food=sim.queen_food,
+        )
+
+    def _frame_loop(self):
+        """Writer thread: render and encode queued frames until the None sentinel"""
+        while True:
+            state = self._frames.get()
+            if state is None:
                 return
+            try:
+                self._render_frame(state)
+            except Exception as e:
+                print(f"    Video frame error: {e}")
+
+    def _render_frame(self, state):
+        """Update the figure's artists from a frame state, draw it and stream it to the encoder"""
+        # Pheromone heatmap
+        grid_max = max(state.ghost_grid.max(), 1)
+        np.divide(state.ghost_grid.T, grid_max, out=self._display_grid)
+        self.img_artist.set_data(self._display_grid)
+
+        # Food sources
+        for (consumed, amount, max_amount), food_rect, food_text in zip(state.foods, self.food_patches,
+                                                                        self.food_texts):
+            if consumed:
+                food_rect.set_facecolor('gray')
+                food_rect.set_alpha(0.5)
+                food_text.set_visible(False)
+            else:
+                ratio = amount / max_amount
+                food_rect.set_facecolor((1 - ratio, ratio, 0))
+                food_rect.set_alpha(0.8)
+                food_text.set_text(f'{int(amount)}')
+
+        # Death markers - larger for hoppers
+        self.death_scatter.set_offsets(state.death_xy)
+        self.death_scatter.set_sizes(state.death_sizes)
+
+        # Food markers (hopper finds)
+        self.food_marker_scatter.set_offsets(state.food_marker_xy)
+
+        # Smell markers
+        self.smell_scatter.set_offsets(state.smell_xy)
+
+        # Drone trails (per-drone colors assigned at spawn)
+        self.trail_lines.set_segments(state.segments)
+        self.trail_lines.set_color(state.trail_colors)
+
+        # Drones
+        workers = ~state.is_hopper
+        self.worker_scatter.set_offsets(state.xy[workers])
+        self.worker_scatter.set_facecolor(state.rgbs[workers])
+        self.hopper_scatter.set_offsets(state.xy[state.is_hopper])
+        self.carrying_scatter.set_offsets(state.xy[state.carrying])
+
+        # Stats overlay
+        stats_text = f"t={state.elapsed_time:.1f}s | {state.drone_count} drones"
+        if state.has_food:
+            stats_text += f" | Queen: {state.queen_food:.0f}"
+        self.stats_text.set_text(stats_text)
+
+        # Convert figure to numpy array
+        self.fig.canvas.draw()
+
+        # Stream the RGB view of the RGBA buffer (the encoder copies it)
+        frame = np.asarray(self.fig.canvas.buffer_rgba())
+        self._write_frame(frame[:, :, :3])
+        self.frame_count += 1
+
+    def save(self):
+        """Finish the MP4 stream, release the figure and return the status lines"""
+        # Let the writer thread drain the queued frames first
+        if self._frame_thread is not None:
+            self._frames.put(None)
+            self._frame_thread.join()
+            self._frame_thread = None
 
-        print(f"    Encoding {len(self.frames)} frames to video...")
+        self.fig = None
+
+        if self.writer is None:
+            return None
 
         try:
-            # Use imageio to write MP4
-            iio.imwrite(filepath, self.frames, fps=self.fps, codec='libx264',
-                        plugin='pyav', options={'crf': '23'})
+            self.writer.close()
         except Exception as e:
-            # Fallback to basic imageio if pyav not available
-            try:
-                iio.imwrite(filepath, self.frames, fps=self.fps)
-            except Exception as e2:
-                print(f"    Video save error: {e2}")
-                print("    Try: pip install imageio-ffmpeg")
-                return
+            return f"    Video save error: {e}"
+        finally:
+            self.writer = None
+
+        if not self.frame_count:
+            return "    No frames to save"
 
-        print(f"    Video saved: {filepath}")
-        print(f"    Duration: {len(self.frames) / self.fps:.1f}s @ {self.fps} FPS")
+        return (f"    Video saved: {self.filepath}\n"
+                f"    Duration: {self.frame_count / self.fps:.1f}s @ {self.fps} FPS")
 
 
 def deep_merge(base, override):
@@ -424,6 +803,46 @@ def deep_merge(base, override):
     return result
 
 
+# CLI argument -> config override: (argument, section, key, value from the argument,
+# None to use it as given). Unset/zero arguments are skipped, except the CLI_ZERO_ARGS
+# ones, which are skipped only when not given.
+CLI_OVERRIDES = [
+    ("drones", "drones", "count", None),
+    ("mode", "drones", "behavior_mode", str.upper),
+    ("duration", "simulation", "duration_seconds", None),
+    ("tick_rate", "simulation", "tick_rate", None),
+    ("spawn", "drones", "spawn_pattern", None),
+    ("grid_size", "simulation", "grid_size", None),
+    ("save_state", "recording", "enabled", lambda _: True),
+    ("no_live", "simulation", "live_view", lambda _: False),
+    ("no_screenshot", "recording", "save_screenshot", lambda _: False),
+    ("grid_dtype", "simulation", "grid_dtype", None),
+    # Food
+    ("food_sources", "food", "enabled", lambda _: True),
+    ("food_sources", "food", "sources", None),
+    ("food_amount", "food", "amount", None),
+    ("food_spread", "food", "spread", str.lower),
+    ("food_radius", "food", "radius", None),
+    ("food_detection", "food", "detection_radius", None),
+    # Hunger
+    ("hunger_decay", "hunger", "decay_interval", None),
+    ("no_hunger", "hunger", "enabled", lambda _: False),
+    ("death_mode", "hunger", "death_mode", None),
+    # Hoppers
+    ("hoppers", "hoppers", "count", None),
+    ("hop_distance", "hoppers", "hop_distance", None),
+    # Queen position
+    ("queen_x", "queen", "x", None),
+    ("queen_y", "queen", "y", None),
+    # Recording
+    ("record", "recording", "keyframe_recording", lambda _: True),
+    ("keyframe_interval", "recording", "keyframe_interval", None),
+    ("record_format", "recording", "format", None),
+    ("video", "recording", "video_enabled", lambda _: True),
+]
+CLI_ZERO_ARGS = {"queen_x", "queen_y"}
+
+
 def load_config():
     """Load configuration from file, falling back to defaults"""
     if os.path.exists(CONFIG_FILE):
@@ -440,38 +859,71 @@ class Simulation:
         self.config = config
         self.grid_size = config["simulation"]["grid_size"]
         self.margin = 10
-
-        # Grids
-        self.hive_grid = np.zeros((self.grid_size, self.grid_size), dtype=float)
-        self.ghost_grid = np.zeros((self.grid_size, self.grid_size), dtype=float)
+        # Position bounds shared by every clamp (drones stay within margin of the edge)
+        self._clamp_lo, self._clamp_hi = self.margin, self.grid_size - self.margin
+
+        # Grids (float32 by default - pheromone levels are capped at 255, so single precision is
+        # plenty and halves the memory traffic of the per-tick decay and deposit passes).
+        # float16 halves it again; its ~3 significant digits still hold the 0.5 ghost deposits,
+        # but decay rates above ~0.999 round back to the same value and stop decaying.
+        # uint8 would truncate fractional deposits, so it isn't offered.
+        grid_dtype = np.dtype(self.config["simulation"].get("grid_dtype", "float32"))
+        if grid_dtype not in (np.float32, np.float16):
+            raise ValueError(f"Unsupported grid_dtype: {grid_dtype} (use float32 or float16)")
+        self.hive_grid = np.zeros((self.grid_size, self.grid_size), dtype=grid_dtype)
+        self.ghost_grid = np.zeros((self.grid_size, self.grid_size), dtype=grid_dtype)
+        # numba has no float16 support - half-precision grids use the plain numpy decay
+        self._grids_jit = njit is not None and grid_dtype == np.float32
 
         # Drones
         self.drones = {}
 
-        # Food sources
+        # Food sources (dicts for export/recording, mirrored into arrays for the hot-path checks)
         self.food_sources = []
+        self._rebuild_food_arrays()
 
         # Queen position and food storage (for FEED_QUEEN mode)
         queen_config = config.get("queen", {})
         self.queen_pos = (queen_config.get("x", 10), queen_config.get("y", 10))
         self.queen_food = 0
         self.trips_completed = 0
+        self._carrier_count = 0  # Drones in the "carrying" state, kept in step with pickup/dropoff/death
+
+        # Markers are ring buffers of the most recent events, so memory and render cost stay
+        # bounded on long runs
+        max_markers = self.config["simulation"].get("max_markers", 10000)
 
         # Death markers (where drones died)
-        self.death_markers = []
+        self.death_markers = deque(maxlen=max_markers)
 
         # Food markers (where hoppers found food)
-        self.food_markers = []
+        self.food_markers = deque(maxlen=max_markers)
 
         # Smell markers (where hoppers detected food nearby but didn't eat)
-        self.smell_markers = []
+        self.smell_markers = deque(maxlen=max_markers)
+
+        # Hopper ghost deposit stencils - linear falloff with Manhattan distance; the
+        # centre is 2 because it gets the direct deposit plus the spread
+        offsets = np.abs(np.arange(-2, 3))
+        self._beacon_stencil = 1 - (offsets[:, np.newaxis] + offsets[np.newaxis, :]) / 6
+        self._beacon_stencil[2, 2] += 1
+        offsets = np.abs(np.arange(-1, 2))
+        self._smell_stencil = 1 - (offsets[:, np.newaxis] + offsets[np.newaxis, :]) / 4
+        self._smell_stencil[1, 1] += 1
 
         # Dead drones (for registry display)
         self.dead_drones = {}
 
-        # Metrics
-        self.metrics_history = []
+        # Display color per drone ID, assigned once at spawn
+        self._drone_colors = {}
+
+        # Metrics (structured array, preallocated by run() for the whole session)
+        self.metrics_history = np.zeros(0, dtype=METRICS_DTYPE)
         self.start_time = None
+        # Metrics CSV streamed during run() - its path, then (file, csv writer, path) once
+        # the first sample opens it
+        self._metrics_csv_path = None
+        self._metrics_csv = None
 
         # Tick counter for hunger decay
         self.tick_counter = 0
@@ -479,116 +931,257 @@ class Simulation:
         # Live config tracking
         self.last_config_check = 0
         self.config_check_interval = 0.5  # Check every 0.5 seconds
+        self._live_config_mtime = None  # Only re-read the file when it changes
 
         # Recording
         self.recorder = None
         self.video_recorder = None
 
+        # Drone positions/velocities as arrays (rebuilt after drones spawn, die or respawn)
+        self._snapshot_valid = False
+
+        # Live state is written every live_view_interval ticks on a background thread;
+        # a write still in flight when the next one is due means that frame is skipped
+        self.live_view_interval = max(1, self.config["simulation"].get("live_view_interval", 3))
+        self._live_writer = ThreadPoolExecutor(1)
+        self._pending_write = None
+
+        # Random source for per-tick batched draws (simulation.seed makes runs repeatable)
+        self.rng = np.random.default_rng(self.config["simulation"].get("seed"))
+
+        # Behavior modes and weights, parsed once instead of per drone per tick
+        self._parse_modes()
+        self._refresh_cfg()
+
+    def _refresh_cfg(self):
+        """Flatten the config values read per drone per tick into one namespace (rerun after config changes)"""
+        food_config = self.config.get("food", {})
+        hunger_config = self.config.get("hunger", {})
+        hopper_config = self.config.get("hoppers", {})
+        pheromone_config = self.config["pheromones"]
+        params = self.config["behavior_params"]
+        self._cfg = SimpleNamespace(
+            params=params,
+            move_probability=params["move_probability"],
+            deposit_amount=pheromone_config["deposit_amount"],
+            ghost_deposit=pheromone_config["ghost_deposit"],
+            decay_rate=np.float32(pheromone_config["decay_rate"]),
+            food_enabled=food_config.get("enabled", False),
+            detection_radius=food_config.get("detection_radius", 20),
+            consumption_rate=food_config.get("consumption_rate", 0.5),
+            pheromone_boost=food_config.get("pheromone_boost", 3.0),
+            hunger_enabled=hunger_config.get("enabled", True),
+            hunger_decay_interval=hunger_config.get("decay_interval", 10),
+            death_mode=hunger_config.get("death_mode", "no"),
+            hop_distance=hopper_config.get("hop_distance", 5),
+            hop_cooldown=hopper_config.get("cooldown_ticks", 3),
+            hop_ghost_multiplier=hopper_config.get("ghost_deposit_multiplier", 10.0),
+            hopper_hunger_mult=hopper_config.get("hunger_decay_multiplier", 0.25),
+            live_view=self.config["simulation"].get("live_view", True)
+        )
+
+        # Hop offsets per direction (truncated toward zero, like int() of the scaled cos/sin)
+        angles = np.arange(HOP_DIRECTIONS) * (2 * np.pi / HOP_DIRECTIONS)
+        hop_dx = np.trunc(np.cos(angles) * self._cfg.hop_distance).astype(int)
+        hop_dy = np.trunc(np.sin(angles) * self._cfg.hop_distance).astype(int)
+        self._hop_offsets = list(zip(hop_dx.tolist(), hop_dy.tolist()))
+
+    def _parse_modes(self):
+        """Parse behavior_mode into mode IDs and their weights"""
+        params = self.config["behavior_params"]
+        names = [m.strip().upper() for m in self.config["drones"]["behavior_mode"].split(",")]
+
+        self._modes = []
+        self._mode_weights = []
+        # Active modes as a bitmask - a mode test is one AND instead of a list scan
+        self.mode_flags = 0
+        for name in names:
+            if name not in MODES:
+                continue  # Unknown modes contribute no movement
+            mode_id, weight_key, default = MODES[name]
+            self._modes.append(mode_id)
+            self._mode_weights.append(params.get(weight_key, default) if weight_key else default)
+            self.mode_flags |= mode_flag(mode_id)
+
+        self._has_feed_queen = bool(self.mode_flags & mode_flag(MODE_FEED_QUEEN))
+        self._needs_neighbors = bool(self.mode_flags & NEIGHBOR_MODE_FLAGS)
+
     def load_live_config(self):
         """Load live config changes from dashboard"""
-        now = time.time()
+        now = time.monotonic()
         if now - self.last_config_check < self.config_check_interval:
             return  # Don't check too frequently
 
         self.last_config_check = now
 
         try:
-            if os.path.exists(LIVE_CONFIG_FILE):
-                with open(LIVE_CONFIG_FILE, 'r') as f:
-                    live_config = json.load(f)
-
-                # Apply pheromone config
-                if 'decay_rate' in live_config:
-                    self.config["pheromones"]["decay_rate"] = live_config['decay_rate']
-                if 'deposit_amount' in live_config:
-                    self.config["pheromones"]["deposit_amount"] = live_config['deposit_amount']
-                if 'ghost_deposit' in live_config:
-                    self.config["pheromones"]["ghost_deposit"] = live_config['ghost_deposit']
-
-                # Apply food config
-                if "food" not in self.config:
-                    self.config["food"] = {}
-                if 'detection_radius' in live_config:
-                    self.config["food"]["detection_radius"] = live_config['detection_radius']
-                if 'pheromone_boost' in live_config:
-                    self.config["food"]["pheromone_boost"] = live_config['pheromone_boost']
-
-                # Apply hunger config
-                if "hunger" not in self.config:
-                    self.config["hunger"] = {}
-                if 'death_mode' in live_config:
-                    self.config["hunger"]["death_mode"] = live_config['death_mode']
+            mtime = os.stat(LIVE_CONFIG_FILE).st_mtime_ns
+        except OSError:
+            return  # No live config written yet
+        if mtime == self._live_config_mtime:
+            return  # Unchanged since last read
+
+        try:
+            with open(LIVE_CONFIG_FILE, 'r') as f:
+                live_config = json.load(f)
+
+            # Apply pheromone config
+            if 'decay_rate' in live_config:
+                self.config["pheromones"]["decay_rate"] = live_config['decay_rate']
+            if 'deposit_amount' in live_config:
+                self.config["pheromones"]["deposit_amount"] = live_config['deposit_amount']
+            if 'ghost_deposit' in live_config:
+                self.config["pheromones"]["ghost_deposit"] = live_config['ghost_deposit']
+
+            # Apply food config
+            if "food" not in self.config:
+                self.config["food"] = {}
+            if 'detection_radius' in live_config:
+                self.config["food"]["detection_radius"] = live_config['detection_radius']
+            if 'pheromone_boost' in live_config:
+                self.config["food"]["pheromone_boost"] = live_config['pheromone_boost']
+
+            # Apply hunger config
+            if "hunger" not in self.config:
+                self.config["hunger"] = {}
+            if 'death_mode' in live_config:
+                self.config["hunger"]["death_mode"] = live_config['death_mode']
+
+            self._parse_modes()
+            self._refresh_cfg()
+            self._live_config_mtime = mtime
 
         except Exception as e:
             pass  # Don't crash simulation if config read fails
 
-    def get_neighbors(self, drone_id, max_distance):
-        """Find all drones within max_distance of the given drone"""
-        drone = self.drones.get(drone_id)
-        if not drone:
-            return {}
+    def _update_snapshot(self):
+        """Gather drone state into arrays (one row per drone)
 
-        neighbors = {}
-        my_x, my_y = drone["x"], drone["y"]
+        This is the array view of the drone dicts: the tick, metrics, hunger decay and
+        rendering all read it. The tick keeps positions and velocities current as drones
+        move (_sync_row); anything else invalidates it.
+        """
+        if self._snapshot_valid:
+            return
 
-        for other_id, other in self.drones.items():
-            if other_id == drone_id:
-                continue
+        n = len(self.drones)
+        drones = self.drones.values()
+        self._ids = list(self.drones)
+        self._roster = list(drones)  # Drone dicts by snapshot row - the tick iterates these
+        self._xs = np.fromiter((d["x"] for d in drones), dtype=float, count=n)
+        self._ys = np.fromiter((d["y"] for d in drones), dtype=float, count=n)
+        self._vxs = np.fromiter((d.get("vx", 0) for d in drones), dtype=float, count=n)
+        self._vys = np.fromiter((d.get("vy", 0) for d in drones), dtype=float, count=n)
+        # Position sums for the swarm center of mass (FLOCK's fallback and SWARM)
+        self._sum_x, self._sum_y = float(self._xs.sum()), float(self._ys.sum())
+        # Hunger lives in 0..100, so int8 keeps the metric scans small
+        self._hunger = np.fromiter((d.get("hunger", 100) for d in drones), dtype=np.int8, count=n)
+        self._is_hopper = np.fromiter((d.get("type") == "hopper" for d in drones), dtype=bool, count=n)
+        self._carrying = np.fromiter((d.get("state") == "carrying" for d in drones), dtype=bool, count=n)
+        self._snapshot_valid = True
+
+    def _sync_row(self, idx, drone):
+        """Copy a drone's new position and velocity into its snapshot row
+
+        Drones updated later in the tick then see it where it moved to, as they would
+        reading the drone dicts.
+        """
+        x, y = drone["x"], drone["y"]
+        self._sum_x += x - self._xs.item(idx)
+        self._sum_y += y - self._ys.item(idx)
+        self._xs[idx] = x
+        self._ys[idx] = y
+        self._vxs[idx] = drone["vx"]
+        self._vys[idx] = drone["vy"]
+
+    def _draw_tick_randoms(self):
+        """Draw all per-drone randomness for this tick in two batched calls.
+
+        Indexed by snapshot row. _rand_probs columns: 0 starving freeze, 1 move probability,
+        2 natural/carry jitter, 3 stall step, 4 forage erratic, 5 hopper angle.
+        _rand_jitter columns (values -1/0/1): 0-1 natural/carry jitter, 2-3 stall step,
+        4-5 RANDOM behavior, 6-7 forage erratic.
+        """
+        n = len(self._ids)
+        self._rand_probs = self.rng.random((n, 6)).tolist()
+        self._rand_jitter = self.rng.integers(-1, 2, size=(n, 8)).tolist()
 
-            dx = other["x"] - my_x
-            dy = other["y"] - my_y
-            dist = (dx**2 + dy**2) ** 0.5
+    def _neighbor_sums(self, idx, params):
+        """NeighborSums for the drone at snapshot row idx, shared by AVOID, FLOCK, ALIGN and BOIDS
 
-            if 0 < dist <= max_distance:
-                neighbors[other_id] = {
-                    "distance": dist,
-                    "dx": dx,
-                    "dy": dy
-                }
-
-        return neighbors
+        Read from the live snapshot rows, so drones updated earlier this tick count at
+        their new positions and velocities.
+        """
+        radius = params["neighbor_radius"]
+        sep_radius = params["separation_distance"] + 2
+        if njit is not None:
+            return NeighborSums(*_neighbor_sums_jit(idx, self._xs, self._ys, self._vxs, self._vys,
+                                                    float(radius * radius), float(sep_radius * sep_radius)))
+
+        dx = self._xs - self._xs[idx]
+        dy = self._ys - self._ys[idx]
+        d2 = dx * dx + dy * dy
+        near = (d2 > 0) & (d2 <= radius * radius)
+        dx, dy, d2 = dx[near], dy[near], d2[near]
+
+        # Separation: neighbors closer than separation_distance + 2, weighted by 1/dist
+        close = d2 < sep_radius * sep_radius
+        weights = 1.0 / np.sqrt(np.maximum(d2[close], 0.25))
+        return NeighborSums(int(near.sum()), float(dx.sum()), float(dy.sum()),
+                            float(self._vxs[near].sum()), float(self._vys[near].sum()),
+                            -float(dx[close] @ weights), -float(dy[close] @ weights))
 
     # --- BEHAVIOR COMPONENTS (return velocity vectors) ---
 
-    def _behavior_avoid(self, drone, neighbors, params):
+    def _behavior_avoid(self, drone, idx, neighbors, params):
         """Avoid nearby drones - separation behavior"""
-        vx, vy = 0.0, 0.0
-        if neighbors:
-            for ndata in neighbors.values():
-                if ndata["distance"] < params["separation_distance"] + 2:
-                    weight = 1.0 / max(ndata["distance"], 0.5)
-                    vx -= ndata["dx"] * weight
-                    vy -= ndata["dy"] * weight
-        return vx, vy
+        return neighbors.sep_x, neighbors.sep_y
 
-    def _behavior_flock(self, drone, neighbors, params):
+    def _behavior_flock(self, drone, idx, neighbors, params):
         """Move toward neighbors - cohesion behavior"""
         vx, vy = 0.0, 0.0
-        if neighbors:
-            avg_dx = np.mean([n["dx"] for n in neighbors.values()])
-            avg_dy = np.mean([n["dy"] for n in neighbors.values()])
-            vx, vy = avg_dx * 0.5, avg_dy * 0.5
+        count = neighbors.count
+        if count:
+            vx = neighbors.dx / count * 0.5
+            vy = neighbors.dy / count * 0.5
         else:
             # Move toward swarm center if no neighbors
-            all_x = [d["x"] for d in self.drones.values()]
-            all_y = [d["y"] for d in self.drones.values()]
-            if all_x and all_y:
-                cx, cy = np.mean(all_x), np.mean(all_y)
-                vx = (cx - drone["x"]) * 0.3
-                vy = (cy - drone["y"]) * 0.3
+            n = len(self._ids)
+            vx = (self._sum_x / n - drone["x"]) * 0.3
+            vy = (self._sum_y / n - drone["y"]) * 0.3
         return vx, vy
 
-    def _behavior_align(self, drone, neighbors, params):
+    def _behavior_align(self, drone, idx, neighbors, params):
         """Align velocity with neighbors"""
         vx, vy = 0.0, 0.0
-        if neighbors:
-            vx_sum = sum(self.drones[nid].get("vx", 0) for nid in neighbors)
-            vy_sum = sum(self.drones[nid].get("vy", 0) for nid in neighbors)
-            vx = vx_sum / len(neighbors)
-            vy = vy_sum / len(neighbors)
+        count = neighbors.count
+        if count:
+            vx = neighbors.vx / count
+            vy = neighbors.vy / count
         return vx, vy
 
-    def _behavior_forage(self, drone, neighbors, params):
+    def _behavior_boids(self, drone, idx, neighbors, params):
+        """BOIDS preset - separation, cohesion and alignment combined in one pass"""
+        count = neighbors.count
+        if count:
+            coh_x = neighbors.dx / count * 0.5
+            coh_y = neighbors.dy / count * 0.5
+            ali_x = neighbors.vx / count
+            ali_y = neighbors.vy / count
+        else:
+            # Isolated drone: cohesion falls back to the swarm center, nothing to align with
+            n = len(self._ids)
+            coh_x = (self._sum_x / n - drone["x"]) * 0.3
+            coh_y = (self._sum_y / n - drone["y"]) * 0.3
+            ali_x, ali_y = 0.0, 0.0
+
+        vx = (neighbors.sep_x * params["separation_weight"] + coh_x * params["cohesion_weight"]
+              + ali_x * params["alignment_weight"])
+        vy = (neighbors.sep_y * params["separation_weight"] + coh_y * params["cohesion_weight"]
+              + ali_y * params["alignment_weight"])
+        return vx, vy
+
+    def _behavior_forage(self, drone, idx, neighbors, params):
         """Move toward food sources - behavior scales with hunger/desperation"""
         vx, vy = 0.0, 0.0
 
@@ -596,69 +1189,76 @@ class Simulation:
         desperation = self.get_desperation(drone)
 
         # Increase detection radius based on desperation (up to 1.5x)
-        food_config = self.config.get("food", {})
-        base_radius = food_config.get("detection_radius", 20)
-        detection_radius = base_radius * (1 + desperation * 0.5)
+        detection_radius = self._cfg.detection_radius * (1 + desperation * 0.5)
 
-        nearby_food = self.detect_food(drone, detection_radius)
+        nearby_food = self.detect_food(drone, detection_radius, k=1)
 
         if nearby_food:
             closest = nearby_food[0]
             vx = closest["direction_x"]
             vy = closest["direction_y"]
             # Normalize and scale speed by desperation (speed 2 to 3)
-            mag = max((vx**2 + vy**2) ** 0.5, 1)
+            mag = max(math.sqrt(vx * vx + vy * vy), 1)
             speed = 2 + desperation  # Faster when hungry
             vx, vy = vx / mag * speed, vy / mag * speed
         else:
             # Erratic movement scales with desperation (more frantic searching)
-            if np.random.random() < desperation * 0.5:
-                vx = np.random.choice([-1, 0, 1]) * (1 + desperation)
-                vy = np.random.choice([-1, 0, 1]) * (1 + desperation)
+            if self._rand_probs[idx][4] < desperation * 0.5:
+                jitter = self._rand_jitter[idx]
+                vx = jitter[6] * (1 + desperation)
+                vy = jitter[7] * (1 + desperation)
             else:
-                # Follow pheromone trails
-                best_pheromone = 0
-                for check_dx in [-1, 0, 1]:
-                    for check_dy in [-1, 0, 1]:
-                        if check_dx == 0 and check_dy == 0:
-                            continue
-                        nx = drone["x"] + check_dx
-                        ny = drone["y"] + check_dy
-                        if self.margin <= nx < self.grid_size - self.margin and \
-                           self.margin <= ny < self.grid_size - self.margin:
-                            p = self.ghost_grid[nx][ny]
-                            if p > best_pheromone:
-                                best_pheromone = p
-                                vx, vy = check_dx * 0.5, check_dy * 0.5
+                # Follow pheromone trails - step toward the strongest of the 8 surrounding cells
+                x, y = drone["x"], drone["y"]
+                lo, hi = self._clamp_lo, self._clamp_hi
+                if lo < x < hi - 1 and lo < y < hi - 1:
+                    # Interior: whole 3x3 window is in bounds (flatten copies, so the grid is untouched)
+                    window = self.ghost_grid[x - 1:x + 2, y - 1:y + 2].flatten()
+                    window[4] = 0  # Ignore own cell
+                    best = int(window.argmax())
+                    if window[best] > 0:
+                        vx, vy = (best // 3 - 1) * 0.5, (best % 3 - 1) * 0.5
+                else:
+                    best_pheromone = 0
+                    for check_dx in [-1, 0, 1]:
+                        for check_dy in [-1, 0, 1]:
+                            if check_dx == 0 and check_dy == 0:
+                                continue
+                            nx = x + check_dx
+                            ny = y + check_dy
+                            if lo <= nx < hi and lo <= ny < hi:
+                                p = self.ghost_grid[nx, ny]
+                                if p > best_pheromone:
+                                    best_pheromone = p
+                                    vx, vy = check_dx * 0.5, check_dy * 0.5
         return vx, vy
 
-    def _behavior_scatter(self, drone, neighbors, params):
+    def _behavior_scatter(self, drone, idx, neighbors, params):
         """Move away from grid center"""
         center_x = self.grid_size // 2
         center_y = self.grid_size // 2
         vx = drone["x"] - center_x
         vy = drone["y"] - center_y
-        mag = max((vx**2 + vy**2) ** 0.5, 1)
+        mag = max(math.sqrt(vx * vx + vy * vy), 1)
         return vx / mag, vy / mag
 
-    def _behavior_swarm(self, drone, neighbors, params):
+    def _behavior_swarm(self, drone, idx, neighbors, params):
         """Move toward swarm center of mass"""
         vx, vy = 0.0, 0.0
-        all_drones = list(self.drones.values())
-        if len(all_drones) > 1:
-            cx = sum(d["x"] for d in all_drones) / len(all_drones)
-            cy = sum(d["y"] for d in all_drones) / len(all_drones)
-            vx = cx - drone["x"]
-            vy = cy - drone["y"]
-            mag = max((vx**2 + vy**2) ** 0.5, 1)
+        n = len(self._ids)
+        if n > 1:
+            vx = self._sum_x / n - drone["x"]
+            vy = self._sum_y / n - drone["y"]
+            mag = max(math.sqrt(vx * vx + vy * vy), 1)
             vx, vy = vx / mag, vy / mag
         return vx, vy
 
-    def _behavior_random(self, drone, neighbors, params):
+    def _behavior_random(self, drone, idx, neighbors, params):
         """Random movement"""
-        return np.random.choice([-1, 0, 1]), np.random.choice([-1, 0, 1])
+        jitter = self._rand_jitter[idx]
+        return jitter[4], jitter[5]
 
-    def _behavior_feed_queen(self, drone, neighbors, params):
+    def _behavior_feed_queen(self, drone, idx, neighbors, params):
         """FEED_QUEEN specific: return to queen when carrying"""
         vx, vy = 0.0, 0.0
         state = drone.get("state", "searching")
@@ -668,111 +1268,95 @@ class Simulation:
             qx, qy = self.queen_pos
             vx = qx - drone["x"]
             vy = qy - drone["y"]
-            mag = max((vx**2 + vy**2) ** 0.5, 1)
+            mag = max(math.sqrt(vx * vx + vy * vy), 1)
             vx, vy = vx / mag * 3, vy / mag * 3  # Strong pull to queen
         else:
             # Use forage behavior when searching
-            vx, vy = self._behavior_forage(drone, neighbors, params)
+            vx, vy = self._behavior_forage(drone, idx, neighbors, params)
 
         return vx, vy
 
     # --- MAIN MOVEMENT CALCULATOR ---
 
-    def calculate_movement(self, drone_id):
+    def calculate_movement(self, idx):
         """Calculate movement based on behavior mode(s) - supports combining modes"""
-        drone = self.drones[drone_id]
-        params = self.config["behavior_params"]
-        mode_str = self.config["drones"]["behavior_mode"]
-        neighbors = self.get_neighbors(drone_id, params["neighbor_radius"])
-
-        # Parse modes (comma-separated)
-        modes = [m.strip().upper() for m in mode_str.split(",")]
+        drone = self._roster[idx]
+        params = self._cfg.params
 
         # PRIORITY: If drone is carrying food in FEED_QUEEN mode, ONLY go to queen
         # Other behaviors are ignored when carrying - delivery is the priority
-        if "FEED_QUEEN" in modes and drone.get("state") == "carrying":
+        if self._has_feed_queen and drone.get("state") == "carrying":
             qx, qy = self.queen_pos
             dir_x = qx - drone["x"]
             dir_y = qy - drone["y"]
-            dx = int(np.sign(dir_x)) if dir_x != 0 else 0
-            dy = int(np.sign(dir_y)) if dir_y != 0 else 0
+            dx = (dir_x > 0) - (dir_x < 0)
+            dy = (dir_y > 0) - (dir_y < 0)
             # Slight randomness for natural movement
-            if np.random.random() < 0.1:
-                dx += np.random.choice([-1, 0, 1])
-                dy += np.random.choice([-1, 0, 1])
-                dx = int(np.sign(dx)) if dx != 0 else 0
-                dy = int(np.sign(dy)) if dy != 0 else 0
+            if self._rand_probs[idx][2] < 0.1:
+                jitter = self._rand_jitter[idx]
+                dx += jitter[0]
+                dy += jitter[1]
+                dx = (dx > 0) - (dx < 0)
+                dy = (dy > 0) - (dy < 0)
             return dx, dy
 
-        # Behavior weights (can be customized in config later)
-        weights = {
-            "AVOID": params.get("avoid_weight", 2.0),
-            "FLOCK": params.get("flock_weight", 1.0),
-            "ALIGN": params.get("align_weight", 0.5),
-            "FORAGE": params.get("forage_weight", 2.0),
-            "SCATTER": params.get("scatter_weight", 1.0),
-            "SWARM": params.get("swarm_weight", 1.0),
-            "RANDOM": params.get("random_weight", 0.3),
-            "FEED_QUEEN": params.get("feed_queen_weight", 3.0),
-            "BOIDS": 1.0,  # BOIDS combines avoid+flock+align internally
-        }
+        # Neighbors at their current positions - drones updated earlier this tick have moved
+        neighbors = self._neighbor_sums(idx, params) if self._needs_neighbors else None
 
         total_vx, total_vy = 0.0, 0.0
 
         # Calculate desperation for hunger-based weight modification
         desperation = self.get_desperation(drone)
 
-        for mode in modes:
-            vx, vy = 0.0, 0.0
-            w = weights.get(mode, 1.0)
-
-            if mode == "AVOID":
+        for mode, w in zip(self._modes, self._mode_weights):
+            if mode == MODE_AVOID:
                 # Reduce avoidance as hunger drops (desperate drones ignore personal space)
                 w = w * (1 - desperation)
-                vx, vy = self._behavior_avoid(drone, neighbors, params)
-            elif mode == "FLOCK":
-                vx, vy = self._behavior_flock(drone, neighbors, params)
-            elif mode == "ALIGN":
-                vx, vy = self._behavior_align(drone, neighbors, params)
-            elif mode == "FORAGE":
-                vx, vy = self._behavior_forage(drone, neighbors, params)
-            elif mode == "SCATTER":
-                vx, vy = self._behavior_scatter(drone, neighbors, params)
-            elif mode == "SWARM":
-                vx, vy = self._behavior_swarm(drone, neighbors, params)
-            elif mode == "RANDOM":
-                vx, vy = self._behavior_random(drone, neighbors, params)
-            elif mode == "FEED_QUEEN":
-                vx, vy = self._behavior_feed_queen(drone, neighbors, params)
-            elif mode == "BOIDS":
-                # BOIDS is a preset combination
-                av_x, av_y = self._behavior_avoid(drone, neighbors, params)
-                fl_x, fl_y = self._behavior_flock(drone, neighbors, params)
-                al_x, al_y = self._behavior_align(drone, neighbors, params)
-                vx = av_x * params["separation_weight"] + fl_x * params["cohesion_weight"] + al_x * params["alignment_weight"]
-                vy = av_y * params["separation_weight"] + fl_y * params["cohesion_weight"] + al_y * params["alignment_weight"]
+                vx, vy = self._behavior_avoid(drone, idx, neighbors, params)
+            elif mode == MODE_FLOCK:
+                vx, vy = self._behavior_flock(drone, idx, neighbors, params)
+            elif mode == MODE_ALIGN:
+                vx, vy = self._behavior_align(drone, idx, neighbors, params)
+            elif mode == MODE_FORAGE:
+                vx, vy = self._behavior_forage(drone, idx, neighbors, params)
+            elif mode == MODE_SCATTER:
+                vx, vy = self._behavior_scatter(drone, idx, neighbors, params)
+            elif mode == MODE_SWARM:
+                vx, vy = self._behavior_swarm(drone, idx, neighbors, params)
+            elif mode == MODE_RANDOM:
+                vx, vy = self._behavior_random(drone, idx, neighbors, params)
+            elif mode == MODE_FEED_QUEEN:
+                vx, vy = self._behavior_feed_queen(drone, idx, neighbors, params)
+            else:
+                # BOIDS is a preset combination of AVOID + FLOCK + ALIGN
+                vx, vy = self._behavior_boids(drone, idx, neighbors, params)
 
             total_vx += vx * w
             total_vy += vy * w
 
         # Add slight randomness for natural movement
-        if np.random.random() < 0.15:
-            total_vx += np.random.choice([-0.5, 0, 0.5])
-            total_vy += np.random.choice([-0.5, 0, 0.5])
+        if self._rand_probs[idx][2] < 0.15:
+            jitter = self._rand_jitter[idx]
+            total_vx += jitter[0] * 0.5
+            total_vy += jitter[1] * 0.5
 
         # Convert to discrete movement
-        dx = int(np.sign(total_vx)) if abs(total_vx) > 0.1 else 0
-        dy = int(np.sign(total_vy)) if abs(total_vy) > 0.1 else 0
+        dx = (total_vx > 0.1) - (total_vx < -0.1)
+        dy = (total_vy > 0.1) - (total_vy < -0.1)
 
         # If no movement, add random step to prevent stalling
-        if dx == 0 and dy == 0 and np.random.random() < 0.5:
-            dx = np.random.choice([-1, 0, 1])
-            dy = np.random.choice([-1, 0, 1])
+        if dx == 0 and dy == 0 and self._rand_probs[idx][3] < 0.5:
+            jitter = self._rand_jitter[idx]
+            dx, dy = jitter[2], jitter[3]
 
         return dx, dy
 
-    def calculate_metrics(self):
-        """Calculate swarm metrics"""
+    def calculate_metrics(self, full=True):
+        """Calculate swarm metrics
+
+        full=False skips the O(N^2) neighbor-distance stats (avg_neighbor_distance and
+        avg_nearest_neighbor are NaN) for samples nothing will read them from.
+        """
         if len(self.drones) == 0:
             # All drones dead - return zeroed metrics
             return {
@@ -797,36 +1381,42 @@ class Simulation:
                 "desperate": 0
             }
 
-        # Collect all neighbor distances
-        all_distances = []
-        nearest_distances = []
+        # Position/velocity arrays (the snapshot is reused by the next tick's movement)
+        self._update_snapshot()
+        xs, ys = self._xs, self._ys
 
-        for did in self.drones:
-            neighbors = self.get_neighbors(did, 100)
-            if neighbors:
-                distances = [n["distance"] for n in neighbors.values()]
-                all_distances.extend(distances)
-                nearest_distances.append(min(distances))
-
-        avg_neighbor_dist = np.mean(all_distances) if all_distances else 0
-        avg_nearest = np.mean(nearest_distances) if nearest_distances else 0
+        # Neighbor distances (pairs within 100 cells, excluding shared cells)
+        avg_neighbor_dist = 0
+        avg_nearest = 0
+        if not full:
+            avg_neighbor_dist = avg_nearest = math.nan
+        else:
+            # d2[i, j] = squared distance between drone i and drone j
+            dx = xs[np.newaxis, :] - xs[:, np.newaxis]
+            dy = ys[np.newaxis, :] - ys[:, np.newaxis]
+            d2 = dx * dx + dy * dy
+            if njit is not None:
+                dist_sum, near_count, nearest_sum, nearest_count = _neighbor_stats_jit(d2, 100.0 * 100.0)
+                if near_count:
+                    avg_neighbor_dist = dist_sum / near_count
+                    avg_nearest = nearest_sum / nearest_count
+            else:
+                near = (d2 > 0) & (d2 <= 100 * 100)
+                if near.any():
+                    avg_neighbor_dist = np.sqrt(d2[near]).mean()
+                    nearest_d2 = np.where(near, d2, np.inf).min(axis=1)
+                    avg_nearest = np.sqrt(nearest_d2[np.isfinite(nearest_d2)]).mean()
 
         # Swarm spread
-        xs = [d["x"] for d in self.drones.values()]
-        ys = [d["y"] for d in self.drones.values()]
-        center_x, center_y = np.mean(xs), np.mean(ys)
-        spread = np.std(xs) + np.std(ys)
+        center_x, center_y = xs.mean(), ys.mean()
+        spread = xs.std() + ys.std()
 
         # Velocity alignment
-        vxs = [d.get("vx", 0) for d in self.drones.values()]
-        vys = [d.get("vy", 0) for d in self.drones.values()]
-        avg_vx, avg_vy = np.mean(vxs), np.mean(vys)
-        alignment = (avg_vx**2 + avg_vy**2) ** 0.5
+        alignment = np.hypot(self._vxs.mean(), self._vys.mean())
 
-        # Collision count
-        positions = [(d["x"], d["y"]) for d in self.drones.values()]
-        unique_positions = len(set(positions))
-        collisions = len(positions) - unique_positions
+        # Collision count - drones sharing a cell (cell key = x * grid_size + y)
+        cells = xs.astype(np.int64) * self.grid_size + ys.astype(np.int64)
+        collisions = len(cells) - np.unique(cells).size
 
         # Grid coverage
         covered_cells = np.sum(self.ghost_grid > 0)
@@ -846,14 +1436,14 @@ class Simulation:
                     food_remaining += food["amount"]
 
         # FEED_QUEEN metrics
-        carriers = sum(1 for d in self.drones.values() if d.get("state") == "carrying")
+        carriers = self._carrier_count
 
         # Hunger metrics
-        hunger_values = [d.get("hunger", 100) for d in self.drones.values()]
-        avg_hunger = np.mean(hunger_values) if hunger_values else 100
-        min_hunger = min(hunger_values) if hunger_values else 100
-        starving_count = sum(1 for h in hunger_values if h <= 0)
-        desperate_count = sum(1 for h in hunger_values if 0 < h <= 20)
+        hunger = self._hunger
+        avg_hunger = hunger.mean()
+        min_hunger = int(hunger.min())
+        starving_count = int((hunger <= 0).sum())
+        desperate_count = int(((hunger > 0) & (hunger <= 20)).sum())
 
         return {
             "avg_neighbor_distance": round(avg_neighbor_dist, 2),
@@ -877,13 +1467,54 @@ class Simulation:
             "desperate": desperate_count
         }
 
+    def _assign_colors(self, drone_ids):
+        """Compute display colors for newly spawned drones"""
+        for did, rgb in zip(drone_ids, drone_colors(drone_ids)):
+            self._drone_colors[did] = rgb
+
+    def get_drone_colors(self):
+        """(N, 3) RGB array of drone colors, in self.drones order"""
+        return np.array([self._drone_colors[did] for did in self.drones], dtype=float).reshape(-1, 3)
+
+    def _rebuild_food_arrays(self):
+        """Mirror food positions, radii and consumed flags into arrays (call when food spawns or is used up)"""
+        foods = self.food_sources
+        self._food_x = np.array([f["x"] for f in foods], dtype=np.int32)
+        self._food_y = np.array([f["y"] for f in foods], dtype=np.int32)
+        self._food_r2 = np.array([f["radius"] * f["radius"] for f in foods], dtype=float)
+        self._food_active = np.array([not f["consumed"] for f in foods], dtype=bool)
+        self._active_food_count = int(self._food_active.sum())
+
+        # Spatial hash of active food: (cell x, cell y) -> indices into food_sources.
+        # A query reaching at most one cell only needs the surrounding 3x3 cells.
+        self._food_max_radius = max((f["radius"] for f in foods), default=0)
+        self._food_cell = max(20, self._food_max_radius + 20)
+        self._food_buckets = {}
+        for i, f in enumerate(foods):
+            if not f["consumed"]:
+                key = (f["x"] // self._food_cell, f["y"] // self._food_cell)
+                self._food_buckets.setdefault(key, []).append(i)
+
+    def foods_near(self, x, y, reach):
+        """Active food sources whose centre may lie within reach of (x, y), in food_sources order"""
+        cell = self._food_cell
+        if reach > cell:
+            return [f for f in self.food_sources if not f["consumed"]]
+        cx, cy = x // cell, y // cell
+        indices = []
+        for gx in (cx - 1, cx, cx + 1):
+            for gy in (cy - 1, cy, cy + 1):
+                indices.extend(self._food_buckets.get((gx, gy), ()))
+        indices.sort()
+        return [self.food_sources[i] for i in indices]
+
     def is_too_close_to_food(self, x, y, min_distance=10):
         """Check if position is within min_distance of any food source"""
-        for food in self.food_sources:
-            dist = ((food["x"] - x)**2 + (food["y"] - y)**2) ** 0.5
-            if dist < min_distance:
-                return True
-        return False
+        if njit is not None:
+            return _near_food_jit(x, y, self._food_x, self._food_y, min_distance * min_distance)
+        fx = self._food_x - x
+        fy = self._food_y - y
+        return bool(np.any(fx * fx + fy * fy < min_distance * min_distance))
 
     def spawn_drones(self):
         """Spawn drones based on configuration (at least 10 cells from food)"""
@@ -891,50 +1522,40 @@ class Simulation:
         pattern = self.config["drones"]["spawn_pattern"]
         max_attempts = 50  # Prevent infinite loop if grid is too crowded
 
+        # Every candidate position each drone may try, drawn in one call: (count, max_attempts, 2)
+        shape = (count, max_attempts, 2)
+        if pattern == "center":
+            candidates = self.grid_size // 2 + self.rng.integers(-5, 6, size=shape)
+        elif pattern == "corners":
+            near, far = self.margin + 5, self.grid_size - self.margin - 5
+            corners = np.array([(near, near), (far, near), (near, far), (far, far)])
+            candidates = corners[np.arange(count) % 4, np.newaxis, :] + self.rng.integers(-3, 4, size=shape)
+        elif pattern == "line":
+            candidates = np.empty(shape, dtype=int)
+            candidates[..., 0] = (self.margin + np.arange(count) * (self.grid_size - 2 * self.margin)
+                                  // max(count - 1, 1))[:, np.newaxis]
+            candidates[..., 1] = self.grid_size // 2
+        elif pattern == "queen":
+            # Spawn at queen's location with slight spread
+            candidates = np.array(self.queen_pos) + self.rng.integers(-3, 4, size=shape)
+        else:  # "random" and unknown patterns
+            candidates = self.rng.integers(self.margin, self.grid_size - self.margin, size=shape)
+        candidates = candidates.tolist()
+
         for i in range(count):
             did = f"S-{i:03d}"
 
-            for attempt in range(max_attempts):
-                if pattern == "random":
-                    x = np.random.randint(self.margin, self.grid_size - self.margin)
-                    y = np.random.randint(self.margin, self.grid_size - self.margin)
-                elif pattern == "center":
-                    x = self.grid_size // 2 + np.random.randint(-5, 6)
-                    y = self.grid_size // 2 + np.random.randint(-5, 6)
-                elif pattern == "corners":
-                    corner = i % 4
-                    if corner == 0:
-                        x, y = self.margin + 5, self.margin + 5
-                    elif corner == 1:
-                        x, y = self.grid_size - self.margin - 5, self.margin + 5
-                    elif corner == 2:
-                        x, y = self.margin + 5, self.grid_size - self.margin - 5
-                    else:
-                        x, y = self.grid_size - self.margin - 5, self.grid_size - self.margin - 5
-                    x += np.random.randint(-3, 4)
-                    y += np.random.randint(-3, 4)
-                elif pattern == "line":
-                    x = self.margin + (i * (self.grid_size - 2 * self.margin) // max(count - 1, 1))
-                    y = self.grid_size // 2
-                elif pattern == "queen":
-                    # Spawn at queen's location with slight spread
-                    qx, qy = self.queen_pos
-                    x = qx + np.random.randint(-3, 4)
-                    y = qy + np.random.randint(-3, 4)
-                else:
-                    x = np.random.randint(self.margin, self.grid_size - self.margin)
-                    y = np.random.randint(self.margin, self.grid_size - self.margin)
-
+            for x, y in candidates[i]:
                 # Check if too close to food (only if food exists)
                 if not self.food_sources or not self.is_too_close_to_food(x, y, min_distance=10):
                     break  # Good position found
 
             self.drones[did] = {
-                "x": int(x),
-                "y": int(y),
+                "x": x,
+                "y": y,
                 "vx": 0,
                 "vy": 0,
-                "trail": [],
+                "trail": deque(maxlen=10),  # Last 10 positions (oldest drops off automatically)
                 "rssi": -50,  # Simulated signal strength
                 "last_seen": time.time(),
                 "state": "searching",  # For FEED_QUEEN: searching, carrying
@@ -944,6 +1565,8 @@ class Simulation:
                 "type": "worker"  # Drone type: worker or hopper
             }
 
+        self._assign_colors([f"S-{i:03d}" for i in range(count)])
+
     def spawn_hoppers(self):
         """Spawn hopper scout drones"""
         hopper_config = self.config.get("hoppers", {})
@@ -952,25 +1575,19 @@ class Simulation:
         if count == 0:
             return
 
-        qx, qy = self.queen_pos
+        # Spawn near queen, kept within bounds
+        positions = np.array(self.queen_pos) + self.rng.integers(-3, 4, size=(count, 2))
+        positions = np.clip(positions, self.margin, self.grid_size - self.margin).tolist()
 
-        for i in range(count):
+        for i, (x, y) in enumerate(positions):
             hid = f"H-{i:03d}"
 
-            # Spawn near queen
-            x = qx + np.random.randint(-3, 4)
-            y = qy + np.random.randint(-3, 4)
-
-            # Keep within bounds
-            x = max(self.margin, min(self.grid_size - self.margin, x))
-            y = max(self.margin, min(self.grid_size - self.margin, y))
-
             self.drones[hid] = {
-                "x": int(x),
-                "y": int(y),
+                "x": x,
+                "y": y,
                 "vx": 0,
                 "vy": 0,
-                "trail": [],
+                "trail": deque(maxlen=20),  # Hoppers keep longer trails to show jumps
                 "rssi": -50,
                 "last_seen": time.time(),
                 "state": "scouting",
@@ -981,6 +1598,8 @@ class Simulation:
                 "hop_cooldown": 0
             }
 
+        self._assign_colors([f"H-{i:03d}" for i in range(count)])
+
     def spawn_food(self):
         """Spawn food sources based on configuration"""
         food_config = self.config.get("food", {})
@@ -992,101 +1611,91 @@ class Simulation:
         amount = food_config.get("amount", 100)
         radius = food_config.get("radius", 3)
 
-        for i in range(count):
-            if spread == "scattered":
-                x = np.random.randint(self.margin + 5, self.grid_size - self.margin - 5)
-                y = np.random.randint(self.margin + 5, self.grid_size - self.margin - 5)
-
-            elif spread == "clustered":
-                cx, cy = self.grid_size // 2, self.grid_size // 2
-                x = cx + np.random.randint(-20, 21)
-                y = cy + np.random.randint(-20, 21)
-
-            elif spread == "corners":
-                corner = i % 4
-                if corner == 0:
-                    x, y = self.margin + 10, self.margin + 10
-                elif corner == 1:
-                    x, y = self.grid_size - self.margin - 10, self.margin + 10
-                elif corner == 2:
-                    x, y = self.margin + 10, self.grid_size - self.margin - 10
-                else:
-                    x, y = self.grid_size - self.margin - 10, self.grid_size - self.margin - 10
-                x += np.random.randint(-5, 6)
-                y += np.random.randint(-5, 6)
-
-            elif spread == "center":
-                x = self.grid_size // 2 + np.random.randint(-10, 11)
-                y = self.grid_size // 2 + np.random.randint(-10, 11)
-
-            elif spread == "perimeter":
-                edge = i % 4
-                if edge == 0:
-                    x = np.random.randint(self.margin, self.grid_size - self.margin)
-                    y = self.margin + 5
-                elif edge == 1:
-                    x = self.grid_size - self.margin - 5
-                    y = np.random.randint(self.margin, self.grid_size - self.margin)
-                elif edge == 2:
-                    x = np.random.randint(self.margin, self.grid_size - self.margin)
-                    y = self.grid_size - self.margin - 5
-                else:
-                    x = self.margin + 5
-                    y = np.random.randint(self.margin, self.grid_size - self.margin)
-
-            else:  # Default to scattered
-                x = np.random.randint(self.margin + 5, self.grid_size - self.margin - 5)
-                y = np.random.randint(self.margin + 5, self.grid_size - self.margin - 5)
-
+        # All food positions in one draw
+        lo, hi = self.margin, self.grid_size - self.margin
+        if spread == "clustered":
+            positions = self.grid_size // 2 + self.rng.integers(-20, 21, size=(count, 2))
+        elif spread == "corners":
+            near, far = lo + 10, hi - 10
+            corners = np.array([(near, near), (far, near), (near, far), (far, far)])
+            positions = corners[np.arange(count) % 4] + self.rng.integers(-5, 6, size=(count, 2))
+        elif spread == "center":
+            positions = self.grid_size // 2 + self.rng.integers(-10, 11, size=(count, 2))
+        elif spread == "perimeter":
+            # Edges in turn (bottom, right, top, left): random along the edge, 5 cells in
+            along = self.rng.integers(lo, hi, size=count)
+            edge = np.arange(count) % 4
+            near, far = lo + 5, hi - 5
+            xs = np.select([edge == 0, edge == 1, edge == 2], [along, far, along], near)
+            ys = np.select([edge == 0, edge == 1, edge == 2], [near, along, far], along)
+            positions = np.column_stack([xs, ys])
+        else:  # "scattered" and unknown spreads
+            positions = self.rng.integers(lo + 5, hi - 5, size=(count, 2))
+
+        for i, (x, y) in enumerate(positions.tolist()):
             self.food_sources.append({
                 "id": f"F-{i:03d}",
-                "x": int(x),
-                "y": int(y),
+                "x": x,
+                "y": y,
                 "amount": float(amount),
                 "max_amount": float(amount),
                 "radius": radius,
                 "consumed": False
             })
 
-    def detect_food(self, drone, detection_radius=None):
-        """Find food sources within detection radius of drone (measured from food edge)"""
-        food_config = self.config.get("food", {})
+        self._rebuild_food_arrays()
+
+    def detect_food(self, drone, detection_radius=None, k=None):
+        """Find food sources within detection radius of drone (measured from food edge), nearest first.
+
+        k limits the result to the k nearest; k=1 finds the nearest in a single pass without sorting.
+        """
         if detection_radius is None:
-            detection_radius = food_config.get("detection_radius", 20)
+            detection_radius = self._cfg.detection_radius
 
         detected = []
+        best_dist = None
         dx, dy = drone["x"], drone["y"]
 
-        for food in self.food_sources:
-            if food["consumed"]:
-                continue
-
-            dist_to_center = ((food["x"] - dx)**2 + (food["y"] - dy)**2) ** 0.5
-            dist_to_edge = max(0, dist_to_center - food["radius"])
+        for food in self.foods_near(dx, dy, detection_radius + self._food_max_radius):
+            fx, fy = food["x"] - dx, food["y"] - dy
+            dist_sq = fx * fx + fy * fy
+            reach = food["radius"] + detection_radius
+            if dist_sq > reach * reach:
+                continue  # Out of range - skip the sqrt
+            dist_to_edge = max(0, math.sqrt(dist_sq) - food["radius"])
 
             if dist_to_edge <= detection_radius:
+                if k == 1:
+                    if best_dist is not None and dist_to_edge >= best_dist:
+                        continue  # Keep the first of equally near sources, as the sort would
+                    best_dist = dist_to_edge
+                    detected.clear()
                 detected.append({
                     "food": food,
                     "distance": dist_to_edge,
-                    "direction_x": food["x"] - dx,
-                    "direction_y": food["y"] - dy
+                    "direction_x": fx,
+                    "direction_y": fy
                 })
 
-        return sorted(detected, key=lambda f: f["distance"])
+        if k == 1:
+            return detected
+        detected.sort(key=lambda f: f["distance"])
+        return detected[:k] if k else detected
 
     def consume_food(self, drone):
         """Drone consumes nearby food (within 1 cell of food edge)"""
-        food_config = self.config.get("food", {})
-        consumption_rate = food_config.get("consumption_rate", 0.5)
+        consumption_rate = self._cfg.consumption_rate
 
         dx, dy = drone["x"], drone["y"]
 
-        for food in self.food_sources:
-            if food["consumed"]:
+        for food in self.foods_near(dx, dy, self._food_max_radius + 1):
+            fx, fy = food["x"] - dx, food["y"] - dy
+            dist_sq = fx * fx + fy * fy
+            reach = food["radius"] + 1
+            if dist_sq > reach * reach:
                 continue
-
-            dist_to_center = ((food["x"] - dx)**2 + (food["y"] - dy)**2) ** 0.5
-            dist_to_edge = max(0, dist_to_center - food["radius"])
+            dist_to_edge = max(0, math.sqrt(dist_sq) - food["radius"])
 
             # Within 1 cell of food edge
             if dist_to_edge <= 1:
@@ -1096,6 +1705,7 @@ class Simulation:
                 if food["amount"] <= 0:
                     food["amount"] = 0
                     food["consumed"] = True
+                    self._rebuild_food_arrays()
 
                 return True  # Drone found food
 
@@ -1103,52 +1713,52 @@ class Simulation:
 
     def is_inside_food(self, x, y):
         """Check if position is inside any food source"""
-        for food in self.food_sources:
-            if food["consumed"]:
-                continue
-            dist = ((food["x"] - x)**2 + (food["y"] - y)**2) ** 0.5
-            if dist < food["radius"]:
-                return True
-        return False
+        if not self._active_food_count:
+            return False
+        if njit is not None:
+            return _inside_food_jit(x, y, self._food_x, self._food_y, self._food_r2, self._food_active)
+        fx = self._food_x - x
+        fy = self._food_y - y
+        return bool(np.any(self._food_active & (fx * fx + fy * fy < self._food_r2)))
 
     def get_desperation(self, drone):
         """Calculate desperation factor (0.0 = full, 1.0 = starving)"""
         hunger = drone.get("hunger", 100)
         return 1.0 - (hunger / 100.0)
 
-    def update_drone(self, drone_id):
-        """Update a single drone's position"""
-        drone = self.drones[drone_id]
-        params = self.config["behavior_params"]
-        pheromone_config = self.config["pheromones"]
+    def update_drone(self, idx):
+        """Update the position of the drone at snapshot row idx"""
+        drone = self._roster[idx]
+        cfg = self._cfg
+        probs = self._rand_probs[idx]
 
         # Starving drones freeze/slow down (90% chance to skip movement)
-        hunger_config = self.config.get("hunger", {})
-        if hunger_config.get("enabled", True) and drone.get("hunger", 100) <= 0:
-            if np.random.random() > 0.1:
+        if cfg.hunger_enabled and drone.get("hunger", 100) <= 0:
+            if probs[0] > 0.1:
                 return
 
         # Check move probability
-        if np.random.random() > params["move_probability"]:
+        if probs[1] > cfg.move_probability:
             return
 
         # Calculate movement
-        dx, dy = self.calculate_movement(drone_id)
+        dx, dy = self.calculate_movement(idx)
 
         # Calculate new position
-        new_x = int(max(self.margin, min(self.grid_size - self.margin, drone["x"] + dx)))
-        new_y = int(max(self.margin, min(self.grid_size - self.margin, drone["y"] + dy)))
+        lo, hi = self._clamp_lo, self._clamp_hi
+        new_x = int(min(max(drone["x"] + dx, lo), hi))
+        new_y = int(min(max(drone["y"] + dy, lo), hi))
 
         # Block movement into food squares - drones stay at edge
         if self.is_inside_food(new_x, new_y):
             # Try moving only in x direction
             if not self.is_inside_food(drone["x"] + dx, drone["y"]):
-                new_x = int(max(self.margin, min(self.grid_size - self.margin, drone["x"] + dx)))
+                new_x = int(min(max(drone["x"] + dx, lo), hi))
                 new_y = drone["y"]
             # Try moving only in y direction
             elif not self.is_inside_food(drone["x"], drone["y"] + dy):
                 new_x = drone["x"]
-                new_y = int(max(self.margin, min(self.grid_size - self.margin, drone["y"] + dy)))
+                new_y = int(min(max(drone["y"] + dy, lo), hi))
             else:
                 # Can't move - stay in place
                 new_x = drone["x"]
@@ -1167,12 +1777,11 @@ class Simulation:
 
         # Update trail
         drone["trail"].append([new_x, new_y])
-        if len(drone["trail"]) > 10:
-            drone["trail"].pop(0)
+        self._sync_row(idx, drone)
 
         # Deposit pheromones (stronger when carrying food - creates trail back to food)
-        deposit = pheromone_config["deposit_amount"]
-        ghost_deposit = pheromone_config["ghost_deposit"]
+        deposit = cfg.deposit_amount
+        ghost_deposit = cfg.ghost_deposit
 
         if drone.get("carrying", 0) > 0:
             # Carrying food - leave strong trail for others to follow
@@ -1182,18 +1791,19 @@ class Simulation:
         self.hive_grid[new_x][new_y] = min(255, self.hive_grid[new_x][new_y] + deposit)
         self.ghost_grid[new_x][new_y] = min(255, self.ghost_grid[new_x][new_y] + ghost_deposit)
 
-    def update_hopper(self, drone_id):
-        """Update a hopper scout drone - jumps long distances looking for food"""
-        drone = self.drones[drone_id]
-        hopper_config = self.config.get("hoppers", {})
-        hop_distance = hopper_config.get("hop_distance", 5)
-        cooldown_ticks = hopper_config.get("cooldown_ticks", 3)
-        ghost_multiplier = hopper_config.get("ghost_deposit_multiplier", 10.0)
+    def update_hopper(self, idx):
+        """Update the hopper scout at snapshot row idx - jumps long distances looking for food"""
+        drone = self._roster[idx]
+        drone_id = self._ids[idx]
+        cfg = self._cfg
+        hop_distance = cfg.hop_distance
+        cooldown_ticks = cfg.hop_cooldown
+        ghost_multiplier = cfg.hop_ghost_multiplier
+        probs = self._rand_probs[idx]
 
         # Starving hoppers freeze
-        hunger_config = self.config.get("hunger", {})
-        if hunger_config.get("enabled", True) and drone.get("hunger", 100) <= 0:
-            if np.random.random() > 0.1:
+        if cfg.hunger_enabled and drone.get("hunger", 100) <= 0:
+            if probs[0] > 0.1:
                 return
 
         # Cooldown check - hopper rests between jumps
@@ -1202,13 +1812,14 @@ class Simulation:
             return
 
         # Pick random direction and jump
-        angle = np.random.random() * 2 * np.pi
-        dx = int(np.cos(angle) * hop_distance)
-        dy = int(np.sin(angle) * hop_distance)
+        dx, dy = self._hop_offsets[int(probs[5] * HOP_DIRECTIONS)]
 
         # Calculate new position
-        new_x = max(self.margin, min(self.grid_size - self.margin, drone["x"] + dx))
-        new_y = max(self.margin, min(self.grid_size - self.margin, drone["y"] + dy))
+        lo, hi = self._clamp_lo, self._clamp_hi
+        new_x = drone["x"] + dx
+        new_x = lo if new_x < lo else (hi if new_x > hi else new_x)
+        new_y = drone["y"] + dy
+        new_y = lo if new_y < lo else (hi if new_y > hi else new_y)
 
         # Update velocity (for trail visualization)
         drone["vx"] = new_x - drone["x"]
@@ -1222,18 +1833,17 @@ class Simulation:
 
         # Update trail (hoppers have longer trails to show jumps)
         drone["trail"].append([new_x, new_y])
-        if len(drone["trail"]) > 20:
-            drone["trail"].pop(0)
+        self._sync_row(idx, drone)
 
         # Check if hopper can smell food nearby
-        nearby_food = self.detect_food(drone, detection_radius=hop_distance + 2)
+        nearby_food = self.detect_food(drone, detection_radius=hop_distance + 2, k=1)
 
         # Check if landed near food and can eat
         if self.consume_food(drone):
             # Actually ate food! Reset hunger and drop beacon
             drone["hunger"] = 100
 
-            base_ghost = self.config["pheromones"]["ghost_deposit"]
+            base_ghost = cfg.ghost_deposit
             beacon_deposit = base_ghost * ghost_multiplier
 
             # Add visual food marker (yellow X) only when actually eating
@@ -1244,16 +1854,8 @@ class Simulation:
                 "tick": self.tick_counter
             })
 
-            # Deposit beacon at current position
-            self.ghost_grid[new_x][new_y] = min(255, self.ghost_grid[new_x][new_y] + beacon_deposit)
-
-            # Also deposit in surrounding cells for visibility
-            for ox in range(-2, 3):
-                for oy in range(-2, 3):
-                    bx = max(0, min(self.grid_size - 1, new_x + ox))
-                    by = max(0, min(self.grid_size - 1, new_y + oy))
-                    falloff = beacon_deposit * (1 - (abs(ox) + abs(oy)) / 6)
-                    self.ghost_grid[bx][by] = min(255, self.ghost_grid[bx][by] + falloff)
+            # Deposit beacon at current position and surrounding cells for visibility
+            self._stamp_ghost(new_x, new_y, self._beacon_stencil, beacon_deposit)
         elif nearby_food:
             # Smelled food but didn't eat - add white X marker
             self.smell_markers.append({
@@ -1265,18 +1867,20 @@ class Simulation:
             })
 
             # Drop 25% strength ghost deposit to guide other drones
-            base_ghost = self.config["pheromones"]["ghost_deposit"]
+            base_ghost = cfg.ghost_deposit
             smell_deposit = base_ghost * ghost_multiplier * 0.25
 
-            self.ghost_grid[new_x][new_y] = min(255, self.ghost_grid[new_x][new_y] + smell_deposit)
-
             # Smaller spread for smell markers
-            for ox in range(-1, 2):
-                for oy in range(-1, 2):
-                    bx = max(0, min(self.grid_size - 1, new_x + ox))
-                    by = max(0, min(self.grid_size - 1, new_y + oy))
-                    falloff = smell_deposit * (1 - (abs(ox) + abs(oy)) / 4)
-                    self.ghost_grid[bx][by] = min(255, self.ghost_grid[bx][by] + falloff)
+            self._stamp_ghost(new_x, new_y, self._smell_stencil, smell_deposit)
+
+    def _stamp_ghost(self, x, y, stencil, amount):
+        """Add amount * stencil to ghost_grid centred on (x, y), clipped to the grid and capped at 255"""
+        r = stencil.shape[0] // 2
+        x0, x1 = max(0, x - r), min(self.grid_size, x + r + 1)
+        y0, y1 = max(0, y - r), min(self.grid_size, y + r + 1)
+        sx, sy = x0 - (x - r), y0 - (y - r)
+        block = self.ghost_grid[x0:x1, y0:y1]
+        np.minimum(block + amount * stencil[sx:sx + x1 - x0, sy:sy + y1 - y0], 255, out=block)
 
     def tick(self):
         """Run one simulation tick"""
@@ -1286,34 +1890,39 @@ class Simulation:
         # Increment tick counter
         self.tick_counter += 1
 
-        food_config = self.config.get("food", {})
-        food_enabled = food_config.get("enabled", False)
-        pheromone_boost = food_config.get("pheromone_boost", 3.0)
-        mode = self.config["drones"]["behavior_mode"]
-        modes = [m.strip().upper() for m in mode.split(",")]
+        cfg = self._cfg
+        food_enabled = cfg.food_enabled
+        pheromone_boost = cfg.pheromone_boost
 
         # Hunger decay configuration
-        hunger_config = self.config.get("hunger", {})
-        hunger_enabled = hunger_config.get("enabled", True)
-        hunger_decay_interval = hunger_config.get("decay_interval", 10)
-        hopper_config = self.config.get("hoppers", {})
-        hopper_hunger_mult = hopper_config.get("hunger_decay_multiplier", 0.25)
+        hunger_enabled = cfg.hunger_enabled
+        hunger_decay_interval = cfg.hunger_decay_interval
+        hopper_hunger_mult = cfg.hopper_hunger_mult
 
-        # Apply hunger decay to all drones
+        # Apply hunger decay to all drones. Hunger only reaches zero here, so this pass also
+        # collects the starved drones for the death handling below
+        starved = []
         if hunger_enabled and self.tick_counter % hunger_decay_interval == 0:
-            for drone in self.drones.values():
-                if drone.get("type") == "hopper":
-                    # Hoppers decay hunger slower (probabilistic)
-                    if np.random.random() < hopper_hunger_mult:
-                        drone["hunger"] = max(0, drone.get("hunger", 100) - 1)
-                else:
-                    drone["hunger"] = max(0, drone.get("hunger", 100) - 1)
+            # Nothing has changed since the last tick ended, so a snapshot built for the
+            # metrics is reused here (and otherwise this build serves the rest of the tick)
+            self._update_snapshot()
+            n = len(self._ids)
+            # Hoppers decay hunger slower (probabilistic)
+            decays = ~self._is_hopper | (self.rng.random(n) < hopper_hunger_mult)
+            hunger = np.maximum(self._hunger - decays, 0).astype(np.int8)
+            for drone, value in zip(self._roster, hunger.tolist()):
+                drone["hunger"] = value
+            self._hunger = hunger
+            starved = [(self._ids[i], self._roster[i]) for i in np.flatnonzero(hunger <= 0).tolist()]
 
         # Handle drone death/respawn based on death_mode
-        death_mode = hunger_config.get("death_mode", "no")
-        if hunger_enabled and death_mode != "no":
-            dead_drones = [(did, d) for did, d in self.drones.items() if d.get("hunger", 100) <= 0]
-            for drone_id, drone in dead_drones:
+        death_mode = cfg.death_mode
+        if starved and death_mode != "no":
+            self._snapshot_valid = False
+            for drone_id, drone in starved:
+                if drone.get("state") == "carrying":
+                    self._carrier_count -= 1  # Its load is lost with it
+
                 # Record death location
                 self.death_markers.append({
                     "x": drone["x"],
@@ -1325,27 +1934,27 @@ class Simulation:
 
                 # Record death event for playback
                 if self.recorder:
-                    elapsed = time.time() - self.start_time if self.start_time else 0
+                    elapsed = time.perf_counter() - self.start_time if self.start_time else 0
                     self.recorder.record_event("death", elapsed,
                         drone=drone_id, x=drone["x"], y=drone["y"],
                         drone_type=drone.get("type", "worker"))
 
                 if death_mode == "yes":
                     # Permanent death - move to dead_drones for registry display
-                    drone["dead"] = True
-                    drone["death_tick"] = self.tick_counter
-                    self.dead_drones[drone_id] = drone.copy()
+                    self.dead_drones[drone_id] = DeadRecord(
+                        drone["x"], drone["y"], drone.get("type", "worker"), self.tick_counter, drone_id)
                     del self.drones[drone_id]
                 elif death_mode == "respawn":
                     # Respawn at queen with full hunger, preserving type
                     qx, qy = self.queen_pos
+                    ox, oy = self.rng.integers(-2, 3, size=2)
                     drone_type = drone.get("type", "worker")
                     self.drones[drone_id] = {
-                        "x": qx + np.random.randint(-2, 3),
-                        "y": qy + np.random.randint(-2, 3),
+                        "x": int(qx + ox),
+                        "y": int(qy + oy),
                         "vx": 0,
                         "vy": 0,
-                        "trail": [],
+                        "trail": deque(maxlen=20 if drone_type == "hopper" else 10),
                         "rssi": -50,
                         "last_seen": time.time(),
                         "state": "scouting" if drone_type == "hopper" else "searching",
@@ -1356,102 +1965,149 @@ class Simulation:
                         "hop_cooldown": 0 if drone_type == "hopper" else None
                     }
 
-        # Update all drones
-        for drone_id in list(self.drones.keys()):
-            drone = self.drones[drone_id]
-
+        # Update all drones in order - each one sees the moves of the drones updated
+        # before it this tick (update_drone/update_hopper keep the snapshot rows current)
+        self._update_snapshot()
+        self._draw_tick_randoms()
+        for idx, drone in enumerate(self._roster):
             # Route to correct update method based on type
             if drone.get("type") == "hopper":
-                self.update_hopper(drone_id)
+                self.update_hopper(idx)
             else:
-                self.update_drone(drone_id)
+                self.update_drone(idx)
 
             # Skip FEED_QUEEN logic for hoppers (they're scouts, not carriers)
-            if "FEED_QUEEN" in modes and food_enabled and drone.get("type") != "hopper":
+            if self._has_feed_queen and food_enabled and drone.get("type") != "hopper":
                 # FEED_QUEEN mode: pickup and dropoff logic
                 if drone.get("state") == "searching":
+                    if not self._active_food_count:
+                        continue  # Nothing left to pick up
                     # Check if at food edge - pickup food
-                    for food in self.food_sources:
-                        if food["consumed"]:
-                            continue
-                        dist = ((food["x"] - drone["x"])**2 + (food["y"] - drone["y"])**2) ** 0.5
-                        if dist <= food["radius"] + 2:  # At edge of food
+                    for food in self.foods_near(drone["x"], drone["y"], self._food_max_radius + 2):
+                        fx, fy = food["x"] - drone["x"], food["y"] - drone["y"]
+                        reach = food["radius"] + 2
+                        if fx * fx + fy * fy <= reach * reach:  # At edge of food
                             # Pickup food
                             pickup_amount = min(2.0, food["amount"])
                             if pickup_amount > 0:
                                 food["amount"] -= pickup_amount
                                 drone["carrying"] = pickup_amount
                                 drone["state"] = "carrying"
+                                self._carrier_count += 1
                                 drone["hunger"] = 100  # Reset hunger on food pickup
                                 if food["amount"] <= 0:
                                     food["amount"] = 0
                                     food["consumed"] = True
+                                    self._rebuild_food_arrays()
                             break
 
                 elif drone.get("state") == "carrying":
                     # Check if at Queen - dropoff food
                     qx, qy = self.queen_pos
-                    dist_to_queen = ((qx - drone["x"])**2 + (qy - drone["y"])**2) ** 0.5
-                    if dist_to_queen <= 3:  # Close enough to Queen
+                    qdx, qdy = qx - drone["x"], qy - drone["y"]
+                    if qdx * qdx + qdy * qdy <= 9:  # Within 3 cells of Queen
                         # Dropoff food
                         self.queen_food += drone["carrying"]
                         drone["carrying"] = 0
                         drone["state"] = "searching"
+                        self._carrier_count -= 1
                         self.trips_completed += 1
 
-            elif food_enabled and "FEED_QUEEN" not in modes and drone.get("type") != "hopper":
+            elif food_enabled and self._active_food_count and drone.get("type") != "hopper":
                 # FORAGE mode - consume food in place (only if NOT in FEED_QUEEN mode)
                 # Hoppers handle eating in update_hopper()
                 if self.consume_food(drone):
                     drone["hunger"] = 100  # Reset hunger on food consumption
                     # Deposit extra pheromones near food (recruitment)
                     x, y = drone["x"], drone["y"]
-                    boost = self.config["pheromones"]["deposit_amount"] * pheromone_boost
+                    boost = cfg.deposit_amount * pheromone_boost
                     self.hive_grid[x][y] = min(255, self.hive_grid[x][y] + boost)
                     self.ghost_grid[x][y] = min(255, self.ghost_grid[x][y] + boost * 0.5)
 
-        # Apply decay
-        decay_rate = self.config["pheromones"]["decay_rate"]
-        self.hive_grid *= decay_rate
+        # Snapshot rows follow the drone dicts only within the tick
+        self._snapshot_valid = False
+
+        # Apply decay (rows split across threads on large grids when numba is available)
+        decay_rate = cfg.decay_rate
+        if self._grids_jit and self.grid_size >= PARALLEL_DECAY_MIN_GRID:
+            _decay_grid_parallel(self.hive_grid, decay_rate)
+        else:
+            self.hive_grid *= decay_rate
 
         # Write state for live dashboard viewing
-        if self.config["simulation"].get("live_view", True):
+        if cfg.live_view and self.tick_counter % self.live_view_interval == 0:
             self.write_live_state()
 
-    def export_metrics(self):
-        """Export metrics to CSV"""
-        if not self.metrics_history:
-            return
+    def metrics_summary(self):
+        """Latest metrics sample as a dict ({} before the first sample)"""
+        if not len(self.metrics_history):
+            return {}
+        # Stats the sample skipped are NaN in the array - None here, so they serialize as null
+        return {name: None if value != value else value
+                for name, value in zip(METRICS_DTYPE.names, self.metrics_history[-1].tolist())}
 
+    def start_metrics_csv(self):
+        """Name the metrics CSV - the file and its header are written with the first sample,
+        so a swarm that dies before then leaves no empty CSV behind"""
         metrics_dir = os.path.join(BASE_DIR, "analysis", "metrics")
         os.makedirs(metrics_dir, exist_ok=True)
 
         timestamp = datetime.now().strftime("%Y-%m-%d_%H%M%S")
         mode = self.config["drones"]["behavior_mode"]
         count = self.config["drones"]["count"]
-        filename = os.path.join(metrics_dir, f"sim_{mode}_{count}drones_{timestamp}.csv")
+        self._metrics_csv_path = os.path.join(metrics_dir, f"sim_{mode}_{count}drones_{timestamp}.csv")
+
+    def write_metrics_row(self, row):
+        """Append a metrics sample to the CSV, opening it and writing the header on the first"""
+        if self._metrics_csv is None:
+            # 64 KB buffer - rows go to disk in block-sized writes, not one per sample
+            f = open(self._metrics_csv_path, 'w', newline='', buffering=65536)
+            writer = csv.writer(f)
+            writer.writerow(METRICS_DTYPE.names)
+            self._metrics_csv = (f, writer, self._metrics_csv_path)
+        self._metrics_csv[1].writerow(row)
+
+    def export_metrics(self):
+        """Finish the metrics CSV streamed during the run"""
+        if self._metrics_csv is None:
+            return
 
-        keys = self.metrics_history[0].keys()
-        with open(filename, 'w', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=keys)
-            writer.writeheader()
-            writer.writerows(self.metrics_history)
+        f, _, filename = self._metrics_csv
+        f.close()
+        self._metrics_csv = None
 
         print(f"    Metrics exported: {filename}")
 
     def write_live_state(self):
-        """Write current state to hive_state.json for dashboard viewing"""
+        """Write current state to hive_state.json for dashboard viewing (in the background)"""
+        if self._pending_write is not None and not self._pending_write.done():
+            return  # Previous frame still being written - drop this one
+        self._pending_write = self._live_writer.submit(self._write_state_file, self._live_state())
+
+    def _drones_json(self):
+        """Drone dicts with trails as plain lists (deque isn't JSON serializable)"""
+        return {k: {**v, "trail": list(v.get("trail", ()))} for k, v in self.drones.items()}
+
+    def _live_state(self):
+        """Snapshot of the dashboard state - copies everything the simulation keeps mutating"""
         food_config = self.config.get("food", {})
 
-        state = {
-            "grid": self.hive_grid.tolist(),
-            "ghost_grid": self.ghost_grid.tolist(),
-            "drones": {k: {**v, "trail": v.get("trail", [])} for k, v in self.drones.items()},
-            "food_sources": self.food_sources,
-            "death_markers": self.death_markers,
-            "food_markers": self.food_markers,
-            "smell_markers": self.smell_markers,
-            "dead_drones": self.dead_drones,
+        # orjson serializes the grids straight from the arrays (float32 - it has no float16);
+        # json needs nested lists
+        if orjson is not None:
+            grid, ghost_grid = self.hive_grid.astype(np.float32), self.ghost_grid.astype(np.float32)
+        else:
+            grid, ghost_grid = self.hive_grid.tolist(), self.ghost_grid.tolist()
+
+        return {
+            "grid": grid,
+            "ghost_grid": ghost_grid,
+            "drones": self._drones_json(),
+            "food_sources": [dict(f) for f in self.food_sources],
+            "death_markers": list(self.death_markers),
+            "food_markers": list(self.food_markers),
+            "smell_markers": list(self.smell_markers),
+            "dead_drones": {did: {**rec._asdict(), "dead": True} for did, rec in self.dead_drones.items()},
             "queen": {
                 "x": self.queen_pos[0],
                 "y": self.queen_pos[1],
@@ -1477,18 +2133,21 @@ class Simulation:
             }
         }
 
+    def _write_state_file(self, state):
+        """Serialize a live state snapshot (atomic rename, so readers never see a partial file)"""
         try:
             tmp_file = HISTORY_FILE + ".tmp"
-            with open(tmp_file, "w") as f:
-                json.dump(state, f)
-                f.flush()
-                os.fsync(f.fileno())
+            with open(tmp_file, "wb") as f:
+                if orjson is not None:
+                    f.write(orjson.dumps(state, option=orjson.OPT_SERIALIZE_NUMPY))
+                else:
+                    f.write(json.dumps(state).encode("utf-8"))
             os.replace(tmp_file, HISTORY_FILE)
         except Exception as e:
             pass  # Don't crash simulation if write fails
 
     def export_final_state(self):
-        """Export final state as JSON (compatible with dashboard)"""
+        """Export final state as JSON (compatible with dashboard) and return its status line"""
         sessions_dir = os.path.join(BASE_DIR, "analysis", "sessions")
         os.makedirs(sessions_dir, exist_ok=True)
 
@@ -1496,22 +2155,33 @@ class Simulation:
         mode = self.config["drones"]["behavior_mode"]
         filename = os.path.join(sessions_dir, f"state_{mode}_{timestamp}.json")
 
+        # orjson serializes the grids (and numpy metric values) directly; json needs nested lists
+        if orjson is not None:
+            grid = self.hive_grid.astype(np.float32, copy=False)
+            ghost_grid = self.ghost_grid.astype(np.float32, copy=False)
+        else:
+            grid, ghost_grid = self.hive_grid.tolist(), self.ghost_grid.tolist()
+
         state = {
-            "grid": self.hive_grid.tolist(),
-            "ghost_grid": self.ghost_grid.tolist(),
-            "drones": self.drones,
+            "grid": grid,
+            "ghost_grid": ghost_grid,
+            "drones": self._drones_json(),
             "food_sources": self.food_sources,
             "config": self.config,
-            "metrics_summary": self.metrics_history[-1] if self.metrics_history else {}
+            "metrics_summary": self.metrics_summary()
         }
 
-        with open(filename, 'w') as f:
-            json.dump(state, f, indent=2)
+        if orjson is not None:
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(state, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2))
+        else:
+            with open(filename, 'w') as f:
+                json.dump(state, f, indent=2)
 
-        print(f"    State exported: {filename}")
+        return f"    State exported: {filename}"
 
     def render_final_map_image(self):
-        """Render and save a PNG screenshot of the final map state"""
+        """Render and save a PNG screenshot of the final map state and return its status line"""
         # Create screenshots directory
         screenshots_dir = os.path.join(BASE_DIR, "analysis", "screenshots")
         os.makedirs(screenshots_dir, exist_ok=True)
@@ -1522,9 +2192,11 @@ class Simulation:
         count = self.config["drones"]["count"]
         filename = os.path.join(screenshots_dir, f"map_{mode}_{count}drones_{timestamp}.png")
 
-        # Create figure with 800x800 pixels
+        # 800x800 pixel figure on its own Agg canvas (no pyplot state); the axes fill it
         dpi = 100
-        fig, ax = plt.subplots(figsize=(8, 8), dpi=dpi)
+        fig = Figure(figsize=(8, 8), dpi=dpi)
+        canvas = FigureCanvasAgg(fig)
+        ax = fig.add_axes([0, 0, 1, 1])
 
         # 1. Black background
         ax.set_facecolor('black')
@@ -1558,10 +2230,11 @@ class Simulation:
         )
         ax.add_patch(boundary_rect)
 
-        # 4. Food sources - colored squares based on consumption state
+        # 4. Food sources - colored squares based on consumption state, added as one collection
+        food_rects, food_faces, food_edges = [], [], []
         for food in self.food_sources:
             if food["consumed"]:
-                color = 'gray'
+                color = (0.5, 0.5, 0.5)  # Gray
                 alpha = 0.5
             else:
                 # Green to red based on remaining amount
@@ -1569,35 +2242,42 @@ class Simulation:
                 color = (1 - ratio, ratio, 0)  # Red when low, green when full
                 alpha = 0.8
 
-            food_rect = patches.Rectangle(
+            food_rects.append(patches.Rectangle(
                 (food["x"] - food["radius"], food["y"] - food["radius"]),
                 food["radius"] * 2,
-                food["radius"] * 2,
-                linewidth=1,
-                edgecolor='white',
-                facecolor=color,
-                alpha=alpha
-            )
-            ax.add_patch(food_rect)
+                food["radius"] * 2
+            ))
+            food_faces.append((*color, alpha))
+            food_edges.append((1, 1, 1, alpha))
 
             # Food amount text
             if not food["consumed"]:
                 ax.text(food["x"], food["y"], f'{int(food["amount"])}',
                         color='white', fontsize=7, ha='center', va='center',
                         fontweight='bold')
+        if food_rects:
+            ax.add_collection(PatchCollection(food_rects, facecolors=food_faces,
+                                              edgecolors=food_edges, linewidths=1))
 
+        # Markers and drones are drawn as one scatter per style (sizes are points^2)
         # 5. Death markers - red X marks at drone death locations (larger for hoppers)
-        for marker in self.death_markers:
-            size = 10 if marker.get("type") == "hopper" else 6
-            ax.plot(marker["x"], marker["y"], 'x', color='red', markersize=size, markeredgewidth=2)
+        if self.death_markers:
+            death_xy = marker_positions(self.death_markers)
+            death_sizes = [100 if m.get("type") == "hopper" else 36 for m in self.death_markers]
+            ax.scatter(death_xy[:, 0], death_xy[:, 1], s=death_sizes, marker='x', color='red',
+                       linewidths=2, zorder=2)
 
         # 6. Food markers - yellow X marks where hoppers found food
-        for marker in self.food_markers:
-            ax.plot(marker["x"], marker["y"], 'x', color='yellow', markersize=5, markeredgewidth=1.5)
+        if self.food_markers:
+            food_xy = marker_positions(self.food_markers)
+            ax.scatter(food_xy[:, 0], food_xy[:, 1], s=25, marker='x', color='yellow',
+                       linewidths=1.5, zorder=2)
 
         # 7. Smell markers - white X marks where hoppers detected food
-        for marker in self.smell_markers:
-            ax.plot(marker["x"], marker["y"], 'x', color='white', markersize=4, markeredgewidth=1, alpha=0.7)
+        if self.smell_markers:
+            smell_xy = marker_positions(self.smell_markers)
+            ax.scatter(smell_xy[:, 0], smell_xy[:, 1], s=16, marker='x', color='white',
+                       linewidths=1, alpha=0.7, zorder=2)
 
         # 8. Queen - white diamond at (10,10)
         qx, qy = self.queen_pos
@@ -1612,56 +2292,31 @@ class Simulation:
         ax.text(sentinel_x, sentinel_y, 'S', color='white', fontsize=6,
                 ha='center', va='center', fontweight='bold')
 
-        # 9.5 Drone trails
-        for drone_id, drone in self.drones.items():
+        # 9.5 Drone trails - in each drone's color (assigned at spawn), as one collection
+        segments, trail_colors = [], []
+        for drone, rgb in zip(self.drones.values(), self.get_drone_colors()):
             trail = drone.get("trail", [])
             if len(trail) >= 2:
-                trail_x = [p[0] for p in trail]
-                trail_y = [p[1] for p in trail]
-                hue = (hash(drone_id) % 360) / 360.0
-                if hue < 1/6:
-                    r, g, b = 1, hue * 6, 0
-                elif hue < 2/6:
-                    r, g, b = 1 - (hue - 1/6) * 6, 1, 0
-                elif hue < 3/6:
-                    r, g, b = 0, 1, (hue - 2/6) * 6
-                elif hue < 4/6:
-                    r, g, b = 0, 1 - (hue - 3/6) * 6, 1
-                elif hue < 5/6:
-                    r, g, b = (hue - 4/6) * 6, 0, 1
-                else:
-                    r, g, b = 1, 0, 1 - (hue - 5/6) * 6
-                ax.plot(trail_x, trail_y, '-', color=(r, g, b),
-                        alpha=0.4, linewidth=1)
-
-        # 10. Drones - colored circles at current positions
-        for i, (drone_id, drone) in enumerate(self.drones.items()):
-            # Generate color based on drone ID (simple hash to HSL-like color)
-            hue = (hash(drone_id) % 360) / 360.0
-            # Convert hue to RGB (simplified)
-            if hue < 1/6:
-                r, g, b = 1, hue * 6, 0
-            elif hue < 2/6:
-                r, g, b = 1 - (hue - 1/6) * 6, 1, 0
-            elif hue < 3/6:
-                r, g, b = 0, 1, (hue - 2/6) * 6
-            elif hue < 4/6:
-                r, g, b = 0, 1 - (hue - 3/6) * 6, 1
-            elif hue < 5/6:
-                r, g, b = (hue - 4/6) * 6, 0, 1
-            else:
-                r, g, b = 1, 0, 1 - (hue - 5/6) * 6
-
-            # Different marker for hoppers vs workers
-            if drone.get("type") == "hopper":
-                ax.plot(drone["x"], drone["y"], '^', color='cyan', markersize=7, markeredgecolor='white', markeredgewidth=0.5)
-            else:
-                ax.plot(drone["x"], drone["y"], 'o', color=(r, g, b), markersize=5, markeredgecolor='white', markeredgewidth=0.5)
-
-            # Carrying indicator - green ring
-            if drone.get("state") == "carrying":
-                ax.plot(drone["x"], drone["y"], 'o', color='none',
-                        markersize=8, markeredgecolor='lime', markeredgewidth=2)
+                segments.append(list(trail))
+                trail_colors.append(rgb)
+        if segments:
+            ax.add_collection(LineCollection(segments, colors=trail_colors, alpha=0.4,
+                                             linewidths=1, zorder=2))
+
+        # 10. Drones - colored circles for workers (per-drone colors assigned at spawn),
+        # cyan triangles for hoppers, green rings for carriers
+        if self.drones:
+            self._update_snapshot()
+            xs, ys = self._xs, self._ys
+            rgbs = self.get_drone_colors()
+            is_hopper, carrying = self._is_hopper, self._carrying
+            workers = ~is_hopper
+            ax.scatter(xs[workers], ys[workers], s=25, marker='o', c=rgbs[workers],
+                       edgecolors='white', linewidths=0.5, zorder=2)
+            ax.scatter(xs[is_hopper], ys[is_hopper], s=49, marker='^', color='cyan',
+                       edgecolors='white', linewidths=0.5, zorder=2)
+            ax.scatter(xs[carrying], ys[carrying], s=64, marker='o', facecolors='none',
+                       edgecolors='lime', linewidths=2, zorder=2)
 
         # Configure axes
         ax.set_xlim(0, self.grid_size)
@@ -1669,12 +2324,11 @@ class Simulation:
         ax.set_aspect('equal')
         ax.axis('off')
 
-        # Save figure
-        plt.tight_layout(pad=0)
-        plt.savefig(filename, facecolor='black', edgecolor='none', bbox_inches='tight', pad_inches=0)
-        plt.close(fig)
+        # Save figure - the layout is fixed, so a single render pass
+        fig.set_facecolor('black')
+        canvas.print_png(filename)
 
-        print(f"    Screenshot saved: {filename}")
+        return f"    Screenshot saved: {filename}"
 
     def run(self):
         """Run the full simulation"""
@@ -1687,11 +2341,11 @@ class Simulation:
         tick_interval = 1.0 / tick_rate
 
         mode = self.config["drones"]["behavior_mode"]
-        modes = [m.strip().upper() for m in mode.split(",")]
+        has_feed_queen = self._has_feed_queen
         drone_count = self.config["drones"]["count"]
 
         # Default to queen spawn for FEED_QUEEN mode (unless explicitly set)
-        if "FEED_QUEEN" in modes and self.config["drones"].get("spawn_pattern") == "random":
+        if has_feed_queen and self.config["drones"].get("spawn_pattern") == "random":
             self.config["drones"]["spawn_pattern"] = "queen"
 
         hopper_count = self.config.get("hoppers", {}).get("count", 0)
@@ -1739,29 +2393,64 @@ class Simulation:
         # Spawn hopper scouts
         self.spawn_hoppers()
 
-        self.start_time = time.time()
+        self.start_time = time.perf_counter()  # Monotonic - only used for elapsed times
+
+        # Recordings of this run share one directory and base name (made once, here)
+        recording_config = self.config.get("recording", {})
+        recordings_dir = os.path.join(BASE_DIR, "recordings")
+        recording_base = None
+        if recording_config.get("keyframe_recording", False) or recording_config.get("video_enabled", False):
+            os.makedirs(recordings_dir, exist_ok=True)
+            timestamp = datetime.now().strftime("%Y-%m-%d_%H%M%S")
+            recording_base = f"sim_{mode.replace(',', '-')}_{drone_count}drones_{timestamp}"
 
         # Start recording if enabled
-        if self.config.get("recording", {}).get("keyframe_recording", False):
+        if recording_config.get("keyframe_recording", False):
             keyframe_interval = self.config["recording"].get("keyframe_interval", 1.0)
-            self.recorder = SimulationRecorder(keyframe_interval)
+            recording_format = self.config["recording"].get("format", "json")
+            self.recorder = SimulationRecorder(keyframe_interval, recording_format)
             self.recorder.start(self)
 
         # Start video recording if enabled
-        if self.config.get("recording", {}).get("video_enabled", False):
+        if recording_config.get("video_enabled", False):
             video_fps = self.config["recording"].get("video_fps", 10)
             video_resolution = self.config["recording"].get("video_resolution", (800, 800))
+            video_file = f"{recording_base}.mp4"
             self.video_recorder = VideoRecorder(fps=video_fps, resolution=video_resolution)
-            self.video_recorder.start()
+            self.video_recorder.start(self, os.path.join(recordings_dir, video_file))
             print(f"    Video recording: {video_fps} FPS")
 
-        # Simulation loop
+        # Loop-invariant settings, read once rather than every tick
+        metrics_enabled = metrics_config["enabled"]
+        sample_rate = metrics_config["sample_rate"]
+        if metrics_enabled:
+            self.metrics_history = np.zeros(total_ticks // sample_rate + 2, dtype=METRICS_DTYPE)
+        # Samples are written to the CSV as they are taken, so a long or crashed run
+        # doesn't lose them
+        export_csv = metrics_enabled and metrics_config["export_csv"]
+        if export_csv:
+            self.start_metrics_csv()
+        samples = 0
+        hunger_enabled = hunger_config.get("enabled", True)
+        recorder = self.recorder
+        video_recorder = self.video_recorder
+
+        # Simulation loop - each tick has a fixed deadline, so sleep rounding doesn't drift
+        # the rate and a late tick is followed by the next one without sleeping
         extinction = False
+        next_deadline = time.perf_counter()
+        # Countdowns to the next metrics sample (tick 0 is sampled) and progress report (each second)
+        metrics_countdown = 1
+        # Sampling stride in ticks - doubled after each second spent behind schedule and
+        # halved back after each second on schedule
+        sample_stride = sample_rate
+        behind_streak = ahead_streak = 0
+        progress_countdown = tick_rate + 1
+        progress_due = False
         for tick in range(total_ticks):
-            tick_start = time.time()
-
             # Run simulation tick
             self.tick()
+            elapsed = time.perf_counter() - self.start_time
 
             # Check for extinction (all drones dead)
             if len(self.drones) == 0:
@@ -1770,56 +2459,91 @@ class Simulation:
                 extinction = True
                 break
 
+            progress_countdown -= 1
+            if progress_countdown == 0:
+                progress_countdown = tick_rate
+                progress_due = True
+
             # Collect metrics
-            if metrics_config["enabled"] and tick % metrics_config["sample_rate"] == 0:
-                metrics = self.calculate_metrics()
+            metrics_countdown -= 1
+            if metrics_enabled and metrics_countdown == 0:
+                metrics_countdown = sample_stride
+                # Neighbor stats are only read from the CSV, the progress line and the
+                # final sample (the next sample would fall past the end)
+                full_metrics = export_csv or progress_due or tick + sample_stride >= total_ticks
+                metrics = self.calculate_metrics(full=full_metrics)
                 metrics["tick"] = tick
-                metrics["time"] = round(time.time() - self.start_time, 2)
-                self.metrics_history.append(metrics)
-
-                # Progress report every second
-                if tick % tick_rate == 0 and tick > 0:
-                    elapsed = time.time() - self.start_time
-                    pct = (tick / total_ticks) * 100
-                    base_msg = (f"  [{pct:5.1f}%] Tick {tick:5d} | "
-                               f"Spread: {metrics['swarm_spread']:5.1f} | "
-                               f"Nearest: {metrics['avg_nearest_neighbor']:4.1f} | "
-                               f"Collisions: {metrics['collisions']:2d}")
+                metrics["time"] = round(elapsed, 2)
+                row = tuple(metrics[name] for name in METRICS_DTYPE.names)
+                self.metrics_history[samples] = row
+                samples += 1
+                if export_csv:
+                    self.write_metrics_row(row)
+
+                # Progress report every second (on the first sample once a second has passed)
+                if progress_due:
+                    progress_due = False
+                    # Mode-specific info
+                    if has_feed_queen and self.food_sources:
+                        extra = f" | Queen: {metrics['queen_food']:.0f} | Trips: {metrics['trips_completed']}"
+                    elif self.food_sources:
+                        extra = f" | Food: {metrics['food_consumed_pct']:.0f}% consumed"
+                    else:
+                        extra = f" | Coverage: {metrics['coverage_percent']:5.1f}%"
 
                     # Add hunger indicator if enabled
-                    hunger_info = ""
-                    if self.config.get("hunger", {}).get("enabled", True):
-                        hunger_info = f" | Hunger: {metrics['avg_hunger']:.0f}%"
+                    if hunger_enabled:
+                        extra += f" | Hunger: {metrics['avg_hunger']:.0f}%"
                         if metrics['starving'] > 0:
-                            hunger_info += f" ({metrics['starving']} starving)"
+                            extra += f" ({metrics['starving']} starving)"
                         elif metrics['desperate'] > 0:
-                            hunger_info += f" ({metrics['desperate']} desperate)"
+                            extra += f" ({metrics['desperate']} desperate)"
 
-                    # Add mode-specific info
-                    if "FEED_QUEEN" in modes and self.food_sources:
-                        print(f"{base_msg} | Queen: {metrics['queen_food']:.0f} | Trips: {metrics['trips_completed']}{hunger_info}")
-                    elif self.food_sources:
-                        print(f"{base_msg} | Food: {metrics['food_consumed_pct']:.0f}% consumed{hunger_info}")
-                    else:
-                        print(f"{base_msg} | Coverage: {metrics['coverage_percent']:5.1f}%{hunger_info}")
+                    # One write and one flush per report
+                    sys.stdout.write(PROGRESS_FMT.format(
+                        pct=tick / total_ticks * 100, tick=tick, spread=metrics['swarm_spread'],
+                        nearest=metrics['avg_nearest_neighbor'], collisions=metrics['collisions'],
+                        extra=extra))
+                    sys.stdout.flush()
 
             # Record keyframe for playback
-            if self.recorder:
-                elapsed = time.time() - self.start_time
-                self.recorder.record_tick(self, elapsed, tick)
+            if recorder:
+                recorder.record_tick(self, elapsed, tick)
 
             # Capture video frame
-            if self.video_recorder:
-                elapsed = time.time() - self.start_time
-                self.video_recorder.capture_frame(self, elapsed)
+            if video_recorder:
+                video_recorder.capture_frame(self, elapsed)
 
             # Maintain tick rate
-            elapsed = time.time() - tick_start
-            if elapsed < tick_interval:
-                time.sleep(tick_interval - elapsed)
+            next_deadline += tick_interval
+            slack = next_deadline - time.perf_counter()
+            if slack > 0:
+                time.sleep(slack)
+                behind_streak = 0
+                ahead_streak += 1
+                if ahead_streak > tick_rate and sample_stride > sample_rate:
+                    sample_stride //= 2
+                    ahead_streak = 0
+                    print(f"  (back on schedule - metrics every {sample_stride} ticks)")
+            else:
+                ahead_streak = 0
+                behind_streak += 1
+                if (behind_streak > tick_rate and metrics_enabled
+                        and sample_stride < sample_rate * MAX_SAMPLE_BACKOFF):
+                    sample_stride *= 2
+                    behind_streak = 0
+                    print(f"  (behind schedule - metrics every {sample_stride} ticks)")
+
+        # Drop the unused preallocated rows (fewer samples on extinction)
+        self.metrics_history = self.metrics_history[:samples]
+
+        # Let any in-flight background write land, then write the final state
+        self._live_writer.shutdown(wait=True)
+        if self.config["simulation"].get("live_view", True):
+            self._write_state_file(self._live_state())
 
         # Final report
-        total_time = time.time() - self.start_time
+        total_time = time.perf_counter() - self.start_time
         effective_rate = total_ticks / total_time
 
         print()
@@ -1834,7 +2558,7 @@ class Simulation:
         if extinction:
             print(f"    Cause:               All drones died")
 
-        if self.metrics_history:
+        if len(self.metrics_history):
             final = self.metrics_history[-1]
             print(f"    Final spread:        {final['swarm_spread']:.1f}")
             print(f"    Final collisions:    {final['collisions']}")
@@ -1846,7 +2570,7 @@ class Simulation:
                 print(f"    Food depleted:       {final['food_depleted']}/{len(self.food_sources)} sources")
 
             # FEED_QUEEN summary
-            if "FEED_QUEEN" in modes:
+            if has_feed_queen:
                 print(f"    Queen food:          {final['queen_food']:.1f}")
                 print(f"    Trips completed:     {final['trips_completed']}")
                 print(f"    Active carriers:     {final['carriers']}")
@@ -1860,35 +2584,36 @@ class Simulation:
         print("=" * 60)
 
         # Export results
-        if metrics_config["export_csv"]:
-            self.export_metrics()
+        self.export_metrics()
 
-        if self.config["recording"]["enabled"]:
-            self.export_final_state()
+        # The remaining outputs are independent writes/encodes of the (now frozen) final
+        # state, so they run side by side. Only the screenshot renders a new figure.
+        with ThreadPoolExecutor(max_workers=4) as ex:
+            futures = []
+            if self.config["recording"]["enabled"]:
+                futures.append(ex.submit(self.export_final_state))
 
-        # Save final map screenshot
-        if self.config["recording"].get("save_screenshot", True):
-            self.render_final_map_image()
+            # Save final map screenshot
+            if self.config["recording"].get("save_screenshot", True):
+                futures.append(ex.submit(self.render_final_map_image))
 
-        # Save keyframe recording for playback
-        if self.recorder:
-            recordings_dir = os.path.join(BASE_DIR, "recordings")
-            os.makedirs(recordings_dir, exist_ok=True)
-            timestamp = datetime.now().strftime("%Y-%m-%d_%H%M%S")
-            mode = self.config["drones"]["behavior_mode"].replace(",", "-")
-            drone_count = self.config["drones"]["count"]
-            filename = f"sim_{mode}_{drone_count}drones_{timestamp}.slimehive"
-            self.recorder.save(self, os.path.join(recordings_dir, filename))
-
-        # Save video recording
-        if self.video_recorder:
-            recordings_dir = os.path.join(BASE_DIR, "recordings")
-            os.makedirs(recordings_dir, exist_ok=True)
-            timestamp = datetime.now().strftime("%Y-%m-%d_%H%M%S")
-            mode = self.config["drones"]["behavior_mode"].replace(",", "-")
-            drone_count = self.config["drones"]["count"]
-            filename = f"sim_{mode}_{drone_count}drones_{timestamp}.mp4"
-            self.video_recorder.save(os.path.join(recordings_dir, filename))
+            # Save keyframe recording for playback
+            if self.recorder:
+                filename = f"{recording_base}.slimehive"
+                if self.recorder.file_format == "npz":
+                    filename += ".npz"
+                futures.append(ex.submit(self.recorder.save, self, os.path.join(recordings_dir, filename)))
+
+            # Finish video recording (frames were streamed to disk during the run)
+            if self.video_recorder:
+                futures.append(ex.submit(self.video_recorder.save))
+
+            # Tasks return their status lines instead of printing them, so the output keeps
+            # this order however the tasks finish (result() also re-raises worker errors)
+            for f in futures:
+                message = f.result()
+                if message:
+                    print(message)
 
         print()
 
@@ -1926,6 +2651,8 @@ Video: --video enables MP4 recording (requires: pip install imageio imageio-ffmp
     parser.add_argument("--save-state", action="store_true", help="Save final state as JSON")
     parser.add_argument("--no-live", action="store_true", help="Disable live dashboard updates")
     parser.add_argument("--no-screenshot", action="store_true", help="Disable final map screenshot")
+    parser.add_argument("--grid-dtype", type=str, choices=["float32", "float16"],
+        help="Pheromone grid precision (default: float32)")
 
     # Food arguments
     parser.add_argument("--food-sources", type=int, help="Number of food sources (enables food)")
@@ -1953,6 +2680,8 @@ Video: --video enables MP4 recording (requires: pip install imageio imageio-ffmp
         help="Enable keyframe recording for playback")
     parser.add_argument("--keyframe-interval", type=float, default=1.0,
         help="Seconds between keyframes (default: 1.0)")
+    parser.add_argument("--record-format", type=str, choices=["json", "npz"],
+        help="Recording file format: json = gzipped .slimehive for the web viewer (default), npz = columnar NumPy arrays")
 
     # Video recording arguments
     parser.add_argument("--video", action="store_true",
@@ -1968,97 +2697,12 @@ Video: --video enables MP4 recording (requires: pip install imageio imageio-ffmp
     config = load_config()
 
     # Override with CLI args
-    if args.drones:
-        config["drones"]["count"] = args.drones
-    if args.mode:
-        config["drones"]["behavior_mode"] = args.mode.upper()
-    if args.duration:
-        config["simulation"]["duration_seconds"] = args.duration
-    if args.tick_rate:
-        config["simulation"]["tick_rate"] = args.tick_rate
-    if args.spawn:
-        config["drones"]["spawn_pattern"] = args.spawn
-    if args.grid_size:
-        config["simulation"]["grid_size"] = args.grid_size
-    if args.save_state:
-        config["recording"]["enabled"] = True
-    if args.no_live:
-        config["simulation"]["live_view"] = False
-    if args.no_screenshot:
-        config["recording"]["save_screenshot"] = False
-
-    # Food configuration overrides
-    if args.food_sources:
-        if "food" not in config:
-            config["food"] = {}
-        config["food"]["enabled"] = True
-        config["food"]["sources"] = args.food_sources
-    if args.food_amount:
-        if "food" not in config:
-            config["food"] = {}
-        config["food"]["amount"] = args.food_amount
-    if args.food_spread:
-        if "food" not in config:
-            config["food"] = {}
-        config["food"]["spread"] = args.food_spread.lower()
-    if args.food_radius:
-        if "food" not in config:
-            config["food"] = {}
-        config["food"]["radius"] = args.food_radius
-    if args.food_detection:
-        if "food" not in config:
-            config["food"] = {}
-        config["food"]["detection_radius"] = args.food_detection
-
-    # Hunger configuration overrides
-    if args.hunger_decay:
-        if "hunger" not in config:
-            config["hunger"] = {}
-        config["hunger"]["decay_interval"] = args.hunger_decay
-    if args.no_hunger:
-        if "hunger" not in config:
-            config["hunger"] = {}
-        config["hunger"]["enabled"] = False
-    if args.death_mode:
-        if "hunger" not in config:
-            config["hunger"] = {}
-        config["hunger"]["death_mode"] = args.death_mode
-
-    # Hopper configuration overrides
-    if args.hoppers:
-        if "hoppers" not in config:
-            config["hoppers"] = {}
-        config["hoppers"]["count"] = args.hoppers
-    if args.hop_distance:
-        if "hoppers" not in config:
-            config["hoppers"] = {}
-        config["hoppers"]["hop_distance"] = args.hop_distance
-
-    # Queen position overrides
-    if args.queen_x is not None:
-        if "queen" not in config:
-            config["queen"] = {}
-        config["queen"]["x"] = args.queen_x
-    if args.queen_y is not None:
-        if "queen" not in config:
-            config["queen"] = {}
-        config["queen"]["y"] = args.queen_y
-
-    # Recording configuration overrides
-    if args.record:
-        if "recording" not in config:
-            config["recording"] = {}
-        config["recording"]["keyframe_recording"] = True
-    if args.keyframe_interval:
-        if "recording" not in config:
-            config["recording"] = {}
-        config["recording"]["keyframe_interval"] = args.keyframe_interval
-
-    # Video configuration overrides
+    for dest, section, key, value in CLI_OVERRIDES:
+        arg = getattr(args, dest)
+        given = arg is not None if dest in CLI_ZERO_ARGS else bool(arg)
+        if given:
+            config.setdefault(section, {})[key] = arg if value is None else value(arg)
     if args.video:
-        if "recording" not in config:
-            config["recording"] = {}
-        config["recording"]["video_enabled"] = True
         config["recording"]["video_fps"] = args.video_fps
         config["recording"]["video_resolution"] = (args.video_resolution, args.video_resolution)
 
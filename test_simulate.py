@@ -0,0 +1,167 @@
+"""
+Deterministic checks for the simulation tick (run with: python -m pytest test_simulate.py)
+
+Drones are updated one at a time within a tick, each seeing the moves of the drones
+updated before it. These checks pin that down against a plain per-drone reference
+and against the flocking it produces. The run-loop bookkeeping around the tick (video
+frame pacing, the metrics CSV) is checked without running a full simulation.
+"""
+
+import copy
+import math
+import queue
+
+import pytest
+
+import simulate
+
+
+def make_sim(count, mode="BOIDS", seed=0, **hunger):
+    """Seeded simulation with hoppers, food and the dashboard out of the picture, and hunger
+    too unless hunger settings are given"""
+    config = copy.deepcopy(simulate.DEFAULT_CONFIG)
+    config["simulation"].update(live_view=False, seed=seed)
+    config["drones"].update(count=count, behavior_mode=mode)
+    config["hunger"].update(hunger or {"enabled": False})
+    config["hoppers"]["count"] = 0
+    sim = simulate.Simulation(config)
+    sim.spawn_food()
+    sim.spawn_drones()
+    return sim
+
+
+@pytest.fixture(autouse=True)
+def no_live_config(monkeypatch, tmp_path):
+    """Keep the dashboard's live config file from changing the parameters mid-test"""
+    monkeypatch.setattr(simulate, "LIVE_CONFIG_FILE", str(tmp_path / "live.json"))
+
+
+def sign(v):
+    """Discrete step for a velocity component (dead zone of 0.1)"""
+    return int(v > 0.1) - int(v < -0.1)
+
+
+def reference_boids_tick(sim, state):
+    """One BOIDS tick computed drone by drone from plain lists, as the simulation did
+    before it was vectorized. state maps drone ID -> [x, y, vx, vy] at the start of the tick
+    and is updated in place; the tick's random draws are taken from sim."""
+    params = sim.config["behavior_params"]
+    radius = params["neighbor_radius"]
+    sep_radius = params["separation_distance"] + 2
+    lo, hi = sim.margin, sim.grid_size - sim.margin
+
+    for idx, drone_id in enumerate(list(state)):
+        probs, jitter = sim._rand_probs[idx], sim._rand_jitter[idx]
+        if probs[1] > params["move_probability"]:
+            continue
+        x, y = state[drone_id][:2]
+
+        neighbors = []
+        for other_id, (ox, oy, ovx, ovy) in state.items():
+            dist = math.sqrt((ox - x) ** 2 + (oy - y) ** 2)
+            if other_id != drone_id and 0 < dist <= radius:
+                neighbors.append((ox - x, oy - y, dist, ovx, ovy))
+
+        # Separation, cohesion, alignment
+        av_x = av_y = 0.0
+        for dx, dy, dist, _, _ in neighbors:
+            if dist < sep_radius:
+                weight = 1.0 / max(dist, 0.5)
+                av_x -= dx * weight
+                av_y -= dy * weight
+        if neighbors:
+            fl_x = sum(n[0] for n in neighbors) / len(neighbors) * 0.5
+            fl_y = sum(n[1] for n in neighbors) / len(neighbors) * 0.5
+            al_x = sum(n[3] for n in neighbors) / len(neighbors)
+            al_y = sum(n[4] for n in neighbors) / len(neighbors)
+        else:
+            cx = sum(s[0] for s in state.values()) / len(state)
+            cy = sum(s[1] for s in state.values()) / len(state)
+            fl_x, fl_y = (cx - x) * 0.3, (cy - y) * 0.3
+            al_x = al_y = 0.0
+        vx = av_x * params["separation_weight"] + fl_x * params["cohesion_weight"] + al_x * params["alignment_weight"]
+        vy = av_y * params["separation_weight"] + fl_y * params["cohesion_weight"] + al_y * params["alignment_weight"]
+
+        if probs[2] < 0.15:
+            vx += jitter[0] * 0.5
+            vy += jitter[1] * 0.5
+        dx, dy = sign(vx), sign(vy)
+        if dx == 0 and dy == 0 and probs[3] < 0.5:
+            dx, dy = jitter[2], jitter[3]
+
+        new_x = min(max(x + dx, lo), hi)
+        new_y = min(max(y + dy, lo), hi)
+        state[drone_id] = [new_x, new_y, new_x - x, new_y - y]
+
+
+def test_tick_matches_sequential_reference():
+    sim = make_sim(30)
+    for _ in range(20):
+        state = {did: [d["x"], d["y"], d["vx"], d["vy"]] for did, d in sim.drones.items()}
+        sim.tick()
+        reference_boids_tick(sim, state)
+        assert {did: [d["x"], d["y"], d["vx"], d["vy"]] for did, d in sim.drones.items()} == state
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_boids_flock_together(seed):
+    sim = make_sim(60, seed=seed)
+    start = sim.calculate_metrics()
+    for _ in range(120):
+        sim.tick()
+    end = sim.calculate_metrics()
+
+    # Sequential BOIDS settles at a spread of ~15 from a random spawn (~45) within a few
+    # seconds; moving every drone from the same pre-tick snapshot stays near the start
+    assert start["swarm_spread"] > 35
+    assert end["swarm_spread"] < 22
+    assert end["collisions"] <= 3
+
+
+def test_seeded_respawn_is_reproducible():
+    def run():
+        sim = make_sim(30, mode="FEED_QUEEN,BOIDS", seed=5, decay_interval=1, death_mode="respawn")
+        for _ in range(150):
+            sim.tick()
+        return sim
+
+    first, second = run(), run()
+    assert first.death_markers  # Drones starved and respawned at the queen
+    assert first.death_markers == second.death_markers
+    assert {did: (d["x"], d["y"], d["vx"], d["vy"], d["hunger"]) for did, d in first.drones.items()} == \
+        {did: (d["x"], d["y"], d["vx"], d["vy"], d["hunger"]) for did, d in second.drones.items()}
+
+
+def test_video_frames_keep_the_frame_rate(monkeypatch):
+    recorder = simulate.VideoRecorder(fps=10)
+    recorder.writer = object()  # Capture without opening an MP4 stream
+    recorder._frames = queue.Queue()
+    monkeypatch.setattr(recorder, "_frame_state", lambda sim, elapsed_time: elapsed_time)
+
+    # 3 s of ticks paced at 30 Hz, each a little late - one frame every 3 ticks
+    for tick in range(90):
+        recorder.capture_frame(None, tick / 30 + 0.004 * (tick % 2))
+    assert recorder._frames.qsize() == 30
+
+    # A 1 s stall restarts the frame clock instead of bursting out the missed frames
+    recorder.capture_frame(None, 4.0)
+    recorder.capture_frame(None, 4.0 + 1 / 30)
+    assert recorder._frames.qsize() == 31
+
+
+def test_metrics_csv_is_written_from_the_first_sample(monkeypatch, tmp_path):
+    monkeypatch.setattr(simulate, "BASE_DIR", str(tmp_path))
+    metrics_dir = tmp_path / "analysis" / "metrics"
+
+    # A run that ends before its first sample leaves no header-only CSV
+    sim = make_sim(5)
+    sim.start_metrics_csv()
+    sim.export_metrics()
+    assert list(metrics_dir.iterdir()) == []
+
+    names = simulate.METRICS_DTYPE.names
+    sim.start_metrics_csv()
+    sim.write_metrics_row(range(len(names)))
+    sim.export_metrics()
+    [path] = metrics_dir.iterdir()
+    assert path.read_text().splitlines() == [",".join(names), ",".join(map(str, range(len(names))))]